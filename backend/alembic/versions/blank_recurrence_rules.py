@@ -0,0 +1,38 @@
+"""Store blank task recurrence rules as NULL
+
+Revision ID: blank_recurrence_rules
+Revises: task_occurrences_unindexed
+Create Date: 2026-10-17 21:38:15.604927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'blank_recurrence_rules'
+down_revision: Union[str, None] = 'task_occurrences_unindexed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Blank rules were never expanded, so these tasks have no occurrences or horizon;
+    # as non-recurring tasks their last occurrence is the due date.
+    tasks = sa.table('tasks',
+        sa.column('recurrence_rule', sa.String()),
+        sa.column('due_date', sa.Date()),
+        sa.column('last_occurrence_date', sa.Date()),
+    )
+    op.execute(
+        tasks.update()
+        .where(sa.func.trim(tasks.c.recurrence_rule) == '')
+        .values(recurrence_rule=None, last_occurrence_date=tasks.c.due_date)
+    )
+
+
+def downgrade() -> None:
+    # The blank rules cannot be told apart from tasks that never had one.
+    pass
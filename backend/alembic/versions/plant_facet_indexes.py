@@ -0,0 +1,30 @@
+"""Add plant facet indexes
+
+Revision ID: plant_facet_indexes
+Revises: plant_search
+Create Date: 2026-10-17 19:26:38.518064
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'plant_facet_indexes'
+down_revision: Union[str, None] = 'plant_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACET_COLUMNS = ['plant_family', 'plant_type', 'sunlight_requirement', 'water_needs', 'organic', 'direct_seedable', 'transplantable']
+
+
+def upgrade() -> None:
+    for column in FACET_COLUMNS:
+        op.create_index(op.f(f'ix_plants_{column}'), 'plants', [column], unique=False)
+
+
+def downgrade() -> None:
+    for column in FACET_COLUMNS:
+        op.drop_index(op.f(f'ix_plants_{column}'), table_name='plants')
@@ -0,0 +1,70 @@
+"""Never reuse plant ids
+
+Revision ID: plant_id_autoincrement
+Revises: blank_recurrence_rules
+Create Date: 2026-10-17 22:15:31.827406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'plant_id_autoincrement'
+down_revision: Union[str, None] = 'blank_recurrence_rules'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ['plant_name', 'variety_name', 'scientific_name', 'plant_family', 'seed_company_source', 'notes_observations']
+SEARCH_TRIGGERS = ['plants_fts_insert', 'plants_fts_delete', 'plants_fts_update']
+
+
+def _drop_search_triggers() -> None:
+    for trigger in SEARCH_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+
+def _create_search_triggers() -> None:
+    """Recreates the plants_fts triggers, which go away with the rebuilt plants table."""
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+    op.execute(
+        f"CREATE TRIGGER plants_fts_insert AFTER INSERT ON plants BEGIN "
+        f"INSERT INTO plants_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER plants_fts_delete AFTER DELETE ON plants BEGIN "
+        f"INSERT INTO plants_fts(plants_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER plants_fts_update AFTER UPDATE ON plants BEGIN "
+        f"INSERT INTO plants_fts(plants_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO plants_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute("INSERT INTO plants_fts(plants_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    _drop_search_triggers()
+    with op.batch_alter_table('plants', recreate='always', table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+        pass
+    _create_search_triggers()
+
+    # Ids of plants deleted before this migration may still be referenced by plantings;
+    # start the sequence past them as well as past the plants that exist.
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'plants'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'plants', MAX("
+        "COALESCE((SELECT MAX(id) FROM plants), 0), "
+        "COALESCE((SELECT MAX(library_plant_id) FROM plantings), 0))"
+    )
+
+
+def downgrade() -> None:
+    _drop_search_triggers()
+    with op.batch_alter_table('plants', recreate='always', table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+        pass
+    _create_search_triggers()
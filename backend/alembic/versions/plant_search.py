@@ -0,0 +1,52 @@
+"""Add plants_fts full-text index
+
+Revision ID: plant_search
+Revises: task_group_index
+Create Date: 2026-10-17 18:47:12.640318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'plant_search'
+down_revision: Union[str, None] = 'task_group_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ['plant_name', 'variety_name', 'scientific_name', 'plant_family', 'seed_company_source', 'notes_observations']
+
+
+def upgrade() -> None:
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+    op.execute(
+        f"CREATE VIRTUAL TABLE plants_fts USING fts5({columns}, content='plants', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        f"CREATE TRIGGER plants_fts_insert AFTER INSERT ON plants BEGIN "
+        f"INSERT INTO plants_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER plants_fts_delete AFTER DELETE ON plants BEGIN "
+        f"INSERT INTO plants_fts(plants_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER plants_fts_update AFTER UPDATE ON plants BEGIN "
+        f"INSERT INTO plants_fts(plants_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO plants_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    # Index the plants that already exist.
+    op.execute("INSERT INTO plants_fts(plants_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS plants_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS plants_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS plants_fts_insert")
+    op.execute("DROP TABLE IF EXISTS plants_fts")
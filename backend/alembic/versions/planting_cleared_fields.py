@@ -0,0 +1,27 @@
+"""Add cleared_fields to plantings
+
+Revision ID: planting_cleared_fields
+Revises: plant_id_autoincrement
+Create Date: 2026-10-17 22:48:06.153290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'planting_cleared_fields'
+down_revision: Union[str, None] = 'plant_id_autoincrement'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('plantings', sa.Column('cleared_fields', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('plantings') as batch_op:
+        batch_op.drop_column('cleared_fields')
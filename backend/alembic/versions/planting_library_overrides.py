@@ -0,0 +1,61 @@
+"""Store planting library fields as overrides of the library plant
+
+Revision ID: planting_library_overrides
+Revises: task_occurrence_states
+Create Date: 2026-10-17 16:41:09.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'planting_library_overrides'
+down_revision: Union[str, None] = 'task_occurrence_states'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Plant columns that plantings used to copy and now only override.
+LIBRARY_PLANT_COLUMNS = [
+    'plant_name', 'variety_name', 'scientific_name', 'plant_family', 'plant_type', 'growth_habit',
+    'origin_heirloom_status', 'organic', 'seed_company_source', 'year_acquired', 'seed_size',
+    'seed_longevity_storage_life', 'germination_temperature_min', 'germination_temperature_max',
+    'germination_temperature_ideal', 'germination_time_days', 'light_requirement_for_germination',
+    'stratification_required', 'scarification_required', 'sowing_depth', 'spacing_in_row',
+    'spacing_low', 'spacing_high', 'direct_seedable', 'transplantable', 'days_to_transplant_low',
+    'days_to_transplant_high', 'time_to_maturity', 'mature_plant_height', 'mature_plant_spread_width',
+    'sunlight_requirement', 'water_needs', 'fertilizer_needs', 'pest_resistance', 'disease_resistance',
+    'cold_hardiness_frost_tolerance', 'heat_tolerance', 'drought_tolerance', 'bolting_tendency',
+    'support_required', 'pruning_required', 'harvest_window_low', 'harvest_window_high',
+    'typical_yield', 'yield_units', 'storage_life_post_harvest', 'requires_pollinator',
+    'notes_observations', 'url', 'weekly_yield',
+]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('plantings') as batch_op:
+        batch_op.alter_column('plant_name', existing_type=sa.String(), nullable=True)
+
+    # Clear every copied value that still matches the library plant. `IS` treats two NULLs
+    # as equal; plantings whose library plant no longer exists keep all their values.
+    for column in LIBRARY_PLANT_COLUMNS:
+        op.execute(
+            f"UPDATE plantings SET {column} = NULL "
+            f"WHERE {column} IS (SELECT plants.{column} FROM plants WHERE plants.id = plantings.library_plant_id) "
+            f"AND EXISTS (SELECT 1 FROM plants WHERE plants.id = plantings.library_plant_id)"
+        )
+
+
+def downgrade() -> None:
+    # Copy the inherited values back before plant_name becomes required again.
+    assignments = ", ".join(
+        f"{column} = COALESCE({column}, (SELECT plants.{column} FROM plants WHERE plants.id = plantings.library_plant_id))"
+        for column in LIBRARY_PLANT_COLUMNS
+    )
+    op.execute(f"UPDATE plantings SET {assignments}")
+    op.execute("UPDATE plantings SET plant_name = '' WHERE plant_name IS NULL")
+
+    with op.batch_alter_table('plantings') as batch_op:
+        batch_op.alter_column('plant_name', existing_type=sa.String(), nullable=False)
@@ -0,0 +1,26 @@
+"""Add task group index
+
+Revision ID: task_group_index
+Revises: planting_library_overrides
+Create Date: 2026-10-17 18:02:51.377215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'task_group_index'
+down_revision: Union[str, None] = 'planting_library_overrides'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_tasks_task_group_id'), 'tasks', ['task_group_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tasks_task_group_id'), table_name='tasks')
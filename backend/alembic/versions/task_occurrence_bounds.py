@@ -0,0 +1,72 @@
+"""Add task last occurrence date and plan/due date index
+
+Revision ID: task_occurrence_bounds
+Revises: task_occurrences
+Create Date: 2026-10-17 11:40:07.902113
+
+"""
+from typing import Sequence, Union
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from dateutil.rrule import rrulestr, rrule
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'task_occurrence_bounds'
+down_revision: Union[str, None] = 'task_occurrences'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mirrors settings.MAX_OCCURRENCES_PER_TASK at the time of this migration.
+MAX_COUNT_TO_WALK = 1000
+
+
+def _last_occurrence_date(rule_string, due_date, recurrence_end_date):
+    """Mirrors recurrence.get_last_occurrence_date for rows that already exist."""
+    last_date = None
+    rule_string = rule_string.replace('Z', '').strip()
+    rule = rrulestr(rule_string, dtstart=datetime.combine(due_date, datetime.min.time()))
+    if isinstance(rule, rrule):
+        if rule._until is not None:
+            last_date = rule._until.date()
+        elif rule._count is not None and rule._count <= MAX_COUNT_TO_WALK:
+            last_date = due_date
+            for occurrence_dt in rule:
+                last_date = occurrence_dt.date()
+    if recurrence_end_date:
+        last_date = min(last_date, recurrence_end_date) if last_date else recurrence_end_date
+    return last_date
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('last_occurrence_date', sa.Date(), nullable=True))
+    op.create_index('ix_tasks_plan_due_date', 'tasks', ['garden_plan_id', 'due_date'], unique=False)
+
+    tasks = sa.table('tasks',
+        sa.column('id', sa.Integer()),
+        sa.column('due_date', sa.Date()),
+        sa.column('recurrence_rule', sa.String()),
+        sa.column('recurrence_end_date', sa.Date()),
+        sa.column('last_occurrence_date', sa.Date()),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(tasks.c.id, tasks.c.due_date, tasks.c.recurrence_rule, tasks.c.recurrence_end_date)
+        .where(tasks.c.recurrence_rule.isnot(None), tasks.c.due_date.isnot(None))
+    ).all()
+    for task_id, due_date, rule_string, recurrence_end_date in rows:
+        try:
+            last_date = _last_occurrence_date(rule_string, due_date, recurrence_end_date)
+        except Exception:
+            # Unparseable rules stay unbounded so they are never pruned.
+            continue
+        connection.execute(tasks.update().where(tasks.c.id == task_id).values(last_occurrence_date=last_date))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_plan_due_date', table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('last_occurrence_date')
@@ -0,0 +1,91 @@
+"""Move completed dates and exdates into task_occurrence_states
+
+Revision ID: task_occurrence_states
+Revises: task_occurrence_bounds
+Create Date: 2026-10-17 14:03:26.517349
+
+"""
+from typing import Sequence, Union
+from datetime import date
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'task_occurrence_states'
+down_revision: Union[str, None] = 'task_occurrence_bounds'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KINDS = {'completed_dates': 'COMPLETED', 'exdates': 'EXCLUDED'}
+
+
+def _parse_dates(value):
+    """Parses a JSON list of ISO dates, skipping anything that is not a date."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    dates = set()
+    for item in value or []:
+        try:
+            dates.add(date.fromisoformat(str(item)[:10]))
+        except ValueError:
+            continue
+    return sorted(dates)
+
+
+def upgrade() -> None:
+    states = op.create_table('task_occurrence_states',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('occurrence_date', sa.Date(), nullable=False),
+    sa.Column('kind', sa.Enum('COMPLETED', 'EXCLUDED', name='occurrencestatekind'), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('task_id', 'occurrence_date', 'kind', name='uq_task_occurrence_states_task_date_kind')
+    )
+
+    tasks = sa.table('tasks',
+        sa.column('id', sa.Integer()),
+        sa.column('completed_dates', sa.JSON()),
+        sa.column('exdates', sa.JSON()),
+    )
+    connection = op.get_bind()
+    rows = []
+    for task_id, completed_dates, exdates in connection.execute(sa.select(tasks.c.id, tasks.c.completed_dates, tasks.c.exdates)):
+        for column, value in (('completed_dates', completed_dates), ('exdates', exdates)):
+            for occurrence_date in _parse_dates(value):
+                rows.append({'task_id': task_id, 'occurrence_date': occurrence_date, 'kind': KINDS[column]})
+    if rows:
+        op.bulk_insert(states, rows)
+
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('exdates')
+        batch_op.drop_column('completed_dates')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.add_column(sa.Column('completed_dates', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('exdates', sa.JSON(), nullable=True))
+
+    states = sa.table('task_occurrence_states',
+        sa.column('task_id', sa.Integer()),
+        sa.column('occurrence_date', sa.Date()),
+        sa.column('kind', sa.String()),
+    )
+    tasks = sa.table('tasks',
+        sa.column('id', sa.Integer()),
+        sa.column('completed_dates', sa.JSON()),
+        sa.column('exdates', sa.JSON()),
+    )
+    connection = op.get_bind()
+    values = {}
+    for task_id, occurrence_date, kind in connection.execute(sa.select(states.c.task_id, states.c.occurrence_date, states.c.kind)):
+        column = 'completed_dates' if kind == 'COMPLETED' else 'exdates'
+        values.setdefault(task_id, {'completed_dates': [], 'exdates': []})[column].append(occurrence_date.isoformat())
+    for task_id, task_values in values.items():
+        connection.execute(tasks.update().where(tasks.c.id == task_id).values(**task_values))
+
+    op.drop_table('task_occurrence_states')
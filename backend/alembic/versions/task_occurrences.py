@@ -0,0 +1,45 @@
+"""Add materialized task occurrences
+
+Revision ID: task_occurrences
+Revises: initial
+Create Date: 2026-10-17 09:12:44.381520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'task_occurrences'
+down_revision: Union[str, None] = 'initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_occurrences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('garden_plan_id', sa.Integer(), nullable=False),
+    sa.Column('occurrence_date', sa.Date(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', name='taskstatus'), nullable=False),
+    sa.ForeignKeyConstraint(['garden_plan_id'], ['garden_plans.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_occurrences_plan_date', 'task_occurrences', ['garden_plan_id', 'occurrence_date'], unique=False)
+    op.create_index(op.f('ix_task_occurrences_task_id'), 'task_occurrences', ['task_id'], unique=False)
+    # Existing tasks have no horizon yet; they are materialized on their first read.
+    op.add_column('tasks', sa.Column('occurrences_start', sa.Date(), nullable=True))
+    op.add_column('tasks', sa.Column('occurrences_end', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('occurrences_end')
+        batch_op.drop_column('occurrences_start')
+    op.drop_index(op.f('ix_task_occurrences_task_id'), table_name='task_occurrences')
+    op.drop_index('ix_task_occurrences_plan_date', table_name='task_occurrences')
+    op.drop_table('task_occurrences')
@@ -0,0 +1,27 @@
+"""Add marker for tasks left out of the occurrence index
+
+Revision ID: task_occurrences_unindexed
+Revises: plant_facet_indexes
+Create Date: 2026-10-17 21:04:52.316840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'task_occurrences_unindexed'
+down_revision: Union[str, None] = 'plant_facet_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('occurrences_unindexed', sa.Boolean(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('occurrences_unindexed')
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark for recurrence.get_occurrences.
+
+Compares the previous approach of running Task.model_validate for every occurrence
+against the current one, which validates the parent task once and stamps out
+shallow copies. Run from the backend directory:
+
+    python benchmark_occurrences.py
+"""
+import timeit
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import recurrence
+from schemas import Task, TaskStatus
+
+START_DATE = date.today() - timedelta(days=365)
+END_DATE = date.today() + timedelta(days=365)
+
+def make_task() -> SimpleNamespace:
+    """Builds a daily task row with some completed and excluded dates."""
+    due_date = START_DATE
+    return SimpleNamespace(
+        id=1,
+        garden_plan_id=1,
+        planting_id=None,
+        task_group_id=None,
+        name="Water beds",
+        description="Deep water the raised beds",
+        due_date=due_date,
+        status=TaskStatus.PENDING,
+        recurrence_rule="FREQ=DAILY;INTERVAL=1",
+        recurrence_end_date=None,
+        completed_dates=[due_date + timedelta(days=i) for i in range(0, 300, 2)],
+        exdates=[due_date + timedelta(days=i) for i in range(1, 300, 7)],
+    )
+
+def validate_per_occurrence(task: SimpleNamespace, start_date: date, end_date: date):
+    """The previous implementation: a full pydantic validation per occurrence."""
+    rule = recurrence.get_rule(task)
+    occurrences = []
+    for occurrence_dt in rule.between(datetime.combine(start_date, datetime.min.time()), datetime.combine(end_date, datetime.max.time()), inc=True):
+        occurrence_date = occurrence_dt.date()
+        if task.exdates and occurrence_date in task.exdates:
+            continue
+        occurrence_task = Task.model_validate(task)
+        occurrence_task.due_date = occurrence_date
+        if task.completed_dates and occurrence_date in task.completed_dates:
+            occurrence_task.status = TaskStatus.COMPLETED
+        occurrences.append(occurrence_task)
+    return occurrences
+
+def run(number: int = 20):
+    task = make_task()
+    count = len(recurrence.get_occurrences(task, START_DATE, END_DATE))
+    baseline = timeit.timeit(lambda: validate_per_occurrence(task, START_DATE, END_DATE), number=number) / number
+    current = timeit.timeit(lambda: recurrence.get_occurrences(task, START_DATE, END_DATE), number=number) / number
+    print(f"Occurrences per call:        {count}")
+    print(f"model_validate per occurrence: {baseline * 1000:.2f} ms")
+    print(f"validate once + model_copy:    {current * 1000:.2f} ms")
+    print(f"Speed-up:                      {baseline / current:.1f}x")
+
+if __name__ == "__main__":
+    run()
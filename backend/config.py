@@ -10,6 +10,28 @@ class Settings(BaseSettings):
         "http://localhost:3000",
         "http://localhost:8444",
     ]
+    # Maximum number of compiled recurrence rules kept in memory.
+    RRULE_CACHE_SIZE: int = 1024
+    # Days before and after today for which recurring task occurrences are materialized.
+    OCCURRENCE_HORIZON_DAYS: int = 365
+    # Extra days materialized past the horizon, so each task's occurrences only need
+    # extending once this many days have passed rather than every day.
+    OCCURRENCE_HORIZON_SLACK_DAYS: int = 30
+    # Occurrence rows fetched per round trip when reading from the index.
+    OCCURRENCE_READ_BATCH_SIZE: int = 1000
+    # Worker processes and tasks per chunk used to expand recurring tasks for the calendar.
+    CALENDAR_EXPANSION_WORKERS: int = 4
+    CALENDAR_CHUNK_SIZE: int = 50
+    # Recurring tasks a calendar request needs before it is worth expanding them in the
+    # worker processes; below this they are expanded inline.
+    CALENDAR_PARALLEL_MIN_TASKS: int = 1000
+    # Occurrence budgets; expansion stops early and reports truncated tasks when exceeded.
+    MAX_OCCURRENCES_PER_TASK: int = 1000
+    MAX_OCCURRENCES_PER_REQUEST: int = 20000
+    # Seconds to coalesce plan touches in memory before writing them; 0 writes each touch immediately.
+    TOUCH_FLUSH_INTERVAL_SECONDS: float = 0
+    # Rows written per transaction by the streaming CSV import.
+    CSV_IMPORT_CHUNK_SIZE: int = 500
 
     # Pydantic-settings configuration
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding='utf-8')
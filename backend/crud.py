@@ -1,11 +1,17 @@
 # backend/crud.py
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, inspect
-from typing import Optional, List, Type
-from datetime import datetime
+from sqlalchemy.orm import Session, selectinload, load_only
+from sqlalchemy import Boolean, text, literal, union_all, desc, inspect, insert, select, update, and_, or_, bindparam, func, case
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Any, Optional, List, Dict, FrozenSet, Type, Tuple
+from datetime import date, datetime, timedelta
+import itertools
+import re
+import time
+from threading import Lock
+from config import settings
 from models import Base
 
-import models, schemas
+import models, schemas, recurrence, versions, plant_cache, fieldsets
 
 # --- Generic Helpers ---
 def _get_by_id(db: Session, model: Type[Base], item_id: int) -> Optional[Base]:
@@ -13,24 +19,107 @@ def _get_by_id(db: Session, model: Type[Base], item_id: int) -> Optional[Base]:
     return db.query(model).filter(model.id == item_id).first()
 
 # --- Query Options Helpers ---
-def _get_garden_plan_load_options() -> List:
-    """Returns common SQLAlchemy load options for GardenPlan queries."""
+def _get_garden_plan_load_options(planting_fields: Optional[FrozenSet[str]] = None) -> List:
+    """
+    Returns common SQLAlchemy load options for GardenPlan queries. Collections are
+    loaded with one SELECT ... IN per relationship, including the tasks nested under
+    each planting, so a plan loads in a fixed number of queries without a joined
+    plantings x tasks row product. A planting fieldset limits the planting columns
+    selected, and skips planting tasks unless 'tasks' is part of it.
+    """
+    if planting_fields is None:
+        return [
+            selectinload(models.GardenPlan.plantings).options(
+                selectinload(models.Planting.tasks),
+                selectinload(models.Planting.library_plant),
+            ),
+            selectinload(models.GardenPlan.tasks)
+        ]
     return [
-        joinedload(models.GardenPlan.plantings),
-        joinedload(models.GardenPlan.tasks)
+        selectinload(models.GardenPlan.plantings).options(*_get_planting_load_options(planting_fields)),
+        selectinload(models.GardenPlan.tasks)
     ]
 
+def _get_planting_load_options(fields: FrozenSet[str]) -> List:
+    """Returns load options selecting only a fieldset's planting columns."""
+    columns = fieldsets.load_only_columns(models.Planting, fields)
+    options = []
+    if 'tasks' in fields:
+        options.append(selectinload(models.Planting.tasks))
+    if not fields.isdisjoint(LIBRARY_PLANT_COLUMNS):
+        # The foreign key and cleared fields have to be loaded too, or each planting
+        # fetches them to find out what it inherits.
+        columns += [models.Planting.library_plant_id, models.Planting.cleared_fields]
+        options.append(selectinload(models.Planting.library_plant))
+    return [load_only(*columns)] + options
+
 # --- Plant CRUD ---
+# Plant columns a planting can override; NULL in the planting means "inherit".
+LIBRARY_PLANT_COLUMNS = [c.key for c in inspect(models.Plant).column_attrs if c.key != 'id' and hasattr(models.Planting, c.key)]
+
 def get_plant_by_id(db: Session, plant_id: int):
     return _get_by_id(db, models.Plant, plant_id)
 
 def get_all_plants(db: Session, skip: int = 0, limit: int = 1000):
     return db.query(models.Plant).order_by(models.Plant.plant_name).offset(skip).limit(limit).all()
 
+# bm25() column weights, in models.PLANT_SEARCH_COLUMNS order: name matches rank first.
+PLANT_SEARCH_WEIGHTS = (10.0, 5.0, 3.0, 2.0, 1.0, 0.5)
+
+def _plant_search_query(q: str) -> Optional[str]:
+    """
+    Turns free text into an FTS5 query: each word becomes a quoted prefix term and all
+    must match. Quoting keeps FTS5 operators and punctuation from reaching the parser.
+    """
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+def search_plants(db: Session, q: str, skip: int = 0, limit: int = 50) -> List[schemas.Plant]:
+    """Ranks plants matching a text search with the plants_fts index and pages the results."""
+    match = _plant_search_query(q)
+    if match is None:
+        return []
+    weights = ", ".join(str(weight) for weight in PLANT_SEARCH_WEIGHTS)
+    plant_ids = db.execute(
+        text(f"SELECT rowid FROM plants_fts WHERE plants_fts MATCH :match ORDER BY bm25(plants_fts, {weights}), rowid LIMIT :limit OFFSET :skip"),
+        {"match": match, "limit": limit, "skip": skip},
+    ).scalars().all()
+    # Rows come from the library cache; ids committed since it was loaded are skipped.
+    plants = (plant_cache.get_plant(db, plant_id) for plant_id in plant_ids)
+    return [plant for plant in plants if plant is not None]
+
+# Indexed plant columns that GET /plants/ filters on and GET /plants/facets counts.
+PLANT_FACET_COLUMNS = ["plant_family", "plant_type", "sunlight_requirement", "water_needs", "organic", "direct_seedable", "transplantable"]
+
+def get_plant_facets(db: Session, filters: Optional[Dict[str, FrozenSet[Any]]] = None) -> schemas.PlantFacets:
+    """
+    Counts the plants per value of every facet column in one UNION ALL of grouped
+    selects. Filters (column -> accepted values) narrow the counts of every other facet
+    but not their own, so a facet keeps showing the values that could be added to it.
+    """
+    conditions = {column: getattr(models.Plant, column).in_(values) for column, values in (filters or {}).items()}
+    counts = union_all(*[
+        select(literal(column).label("facet"), getattr(models.Plant, column).label("value"), func.count().label("count"))
+        .where(*[condition for filtered_column, condition in conditions.items() if filtered_column != column])
+        .group_by(getattr(models.Plant, column))
+        for column in PLANT_FACET_COLUMNS
+    ]).order_by(desc("count"), "value")
+
+    facets: schemas.PlantFacets = {column: [] for column in PLANT_FACET_COLUMNS}
+    for facet, value, count in db.execute(counts):
+        # The value column is typed by the first select, so boolean facets come back as 0/1.
+        if value is not None and isinstance(inspect(models.Plant).columns[facet].type, Boolean):
+            value = bool(value)
+        facets[facet].append(schemas.FacetValueCount(value=value, count=count))
+    return facets
+
 def create_plant(db: Session, plant: schemas.PlantCreate):
     db_plant = models.Plant(**plant.model_dump())
     db.add(db_plant)
     db.commit()
+    versions.bump_library()
     db.refresh(db_plant)
     return db_plant
 
@@ -41,63 +130,151 @@ def update_plant_by_id(db: Session, plant_id: int, plant_update: schemas.PlantUp
         for key, value in update_data.items():
             setattr(db_plant, key, value)
         db.commit()
+        versions.bump_library()
         db.refresh(db_plant)
     return db_plant
 
+def update_plants_bulk(db: Session, plant_updates: List[schemas.PlantBulkUpdate]) -> List[schemas.PlantBulkUpdateResult]:
+    """
+    Applies partial updates to many plants in one transaction. Rows are sent as
+    executemany UPDATEs by primary key; ids that don't exist are reported, not applied.
+    """
+    requested_ids = {plant_update.id for plant_update in plant_updates}
+    existing_ids = {
+        plant_id for (plant_id,) in
+        db.query(models.Plant.id).filter(models.Plant.id.in_(requested_ids))
+    }
+
+    # Merge repeated ids, then group rows by the columns they set: each run of rows with the
+    # same columns goes out as one executemany, not one statement per plant.
+    changes_by_id: Dict[int, dict] = {}
+    for plant_update in plant_updates:
+        if plant_update.id in existing_ids:
+            changes_by_id.setdefault(plant_update.id, {}).update(plant_update.model_dump(exclude_unset=True, exclude={"id"}))
+    rows = sorted(
+        ({"id": plant_id, **changes} for plant_id, changes in changes_by_id.items() if changes),
+        key=lambda row: sorted(row),
+    )
+    if rows:
+        db.execute(update(models.Plant), rows)
+        db.commit()
+        versions.bump_library()
+
+    return [
+        schemas.PlantBulkUpdateResult(
+            id=plant_update.id,
+            status=schemas.PlantBulkUpdateStatus.UPDATED if plant_update.id in existing_ids else schemas.PlantBulkUpdateStatus.NOT_FOUND,
+        )
+        for plant_update in plant_updates
+    ]
+
 def delete_plant_by_id(db: Session, plant_id: int):
     db_plant = get_plant_by_id(db, plant_id)
     if db_plant:
+        detach_plantings(db, [plant_id])
         db.delete(db_plant)
         db.commit()
+        versions.bump_library()
         return True
     return False
 
 def get_tasks_by_group_id(db: Session, group_id: int):
     return db.query(models.Task).filter(models.Task.task_group_id == group_id).all()
 
+def _load_tasks(db: Session, task_ids: List[int]):
+    return db.query(models.Task).filter(models.Task.id.in_(task_ids)).order_by(models.Task.id).all()
+
 def update_tasks_in_group(db: Session, group_id: int, date_diff_days: int):
-    from datetime import timedelta
-    tasks = get_tasks_by_group_id(db, group_id)
-    if not tasks:
+    """
+    Shifts the due dates of every task in a group with one UPDATE, doing the date
+    arithmetic in SQL; last occurrence dates move along with them. Only recurring
+    tasks are loaded, to recompute their bounds and materialized occurrences.
+    """
+    shift = f"{date_diff_days:+d} days"
+    shifted = db.execute(
+        update(models.Task)
+        .where(models.Task.task_group_id == group_id)
+        .values(
+            due_date=func.date(models.Task.due_date, shift),
+            last_occurrence_date=func.date(models.Task.last_occurrence_date, shift),
+        )
+        .returning(models.Task.id, models.Task.garden_plan_id, models.Task.recurrence_rule)
+    ).all()
+    if not shifted:
         return []
 
-    for task in tasks:
-        if task.due_date:
-            task.due_date += timedelta(days=date_diff_days)
+    recurring_ids = [task_id for task_id, _, recurrence_rule in shifted if recurrence_rule]
+    if recurring_ids:
+        for task in _load_tasks(db, recurring_ids):
+            if task.due_date:
+                _update_last_occurrence_date(task)
+                _materialize_task_occurrences(db, task)
 
     db.commit()
-    for task in tasks:
-        db.refresh(task)
+    for plan_id in {plan_id for _, plan_id, _ in shifted}:
+        versions.bump_plan(plan_id)
 
-    return tasks
+    return _load_tasks(db, [task_id for task_id, _, _ in shifted])
 
 def unlink_tasks_in_group(db: Session, group_id: int):
-    tasks = get_tasks_by_group_id(db, group_id)
-    if not tasks:
+    unlinked = db.execute(
+        update(models.Task)
+        .where(models.Task.task_group_id == group_id)
+        .values(task_group_id=None)
+        .returning(models.Task.id, models.Task.garden_plan_id)
+    ).all()
+    if not unlinked:
         return []
 
-    for task in tasks:
-        task.task_group_id = None
-
     db.commit()
-    for task in tasks:
-        db.refresh(task)
+    for plan_id in {plan_id for _, plan_id in unlinked}:
+        versions.bump_plan(plan_id)
 
-    return tasks
+    return _load_tasks(db, [task_id for task_id, _ in unlinked])
 
 # --- Garden Plan CRUD ---
-def get_garden_plan_by_id(db: Session, plan_id: int):
+def get_garden_plan_by_id(db: Session, plan_id: int, planting_fields: Optional[FrozenSet[str]] = None):
     return (
         db.query(models.GardenPlan)
-        .options(*_get_garden_plan_load_options())
+        .options(*_get_garden_plan_load_options(planting_fields))
         .filter(models.GardenPlan.id == plan_id)
         .first()
     )
 
-def get_all_garden_plans(db: Session, skip: int = 0, limit: int = 100):
+def get_garden_plan_summaries(db: Session, skip: int = 0, limit: int = 100):
+    """
+    Lists plans with planting/task counts aggregated in SQL, without loading the plantings
+    or tasks themselves. Each count comes from its own grouped subquery so the two joins
+    don't multiply each other's rows.
+    """
+    flush_pending_touches(db)
+    planting_counts = (
+        db.query(models.Planting.garden_plan_id, func.count(models.Planting.id).label("planting_count"))
+        .group_by(models.Planting.garden_plan_id)
+        .subquery()
+    )
+    task_counts = (
+        db.query(
+            models.Task.garden_plan_id,
+            func.count(models.Task.id).label("task_count"),
+            func.count(case((models.Task.status == models.TaskStatus.PENDING, 1))).label("pending_task_count"),
+        )
+        .group_by(models.Task.garden_plan_id)
+        .subquery()
+    )
     return (
-        db.query(models.GardenPlan)
-        .options(*_get_garden_plan_load_options())
+        db.query(
+            models.GardenPlan.id,
+            models.GardenPlan.name,
+            models.GardenPlan.description,
+            models.GardenPlan.created_date,
+            models.GardenPlan.last_accessed_date,
+            func.coalesce(planting_counts.c.planting_count, 0).label("planting_count"),
+            func.coalesce(task_counts.c.task_count, 0).label("task_count"),
+            func.coalesce(task_counts.c.pending_task_count, 0).label("pending_task_count"),
+        )
+        .outerjoin(planting_counts, planting_counts.c.garden_plan_id == models.GardenPlan.id)
+        .outerjoin(task_counts, task_counts.c.garden_plan_id == models.GardenPlan.id)
         .order_by(desc(models.GardenPlan.last_accessed_date))
         .offset(skip)
         .limit(limit)
@@ -109,6 +286,7 @@ def create_garden_plan(db: Session, plan: schemas.GardenPlanCreate):
     db.add(db_plan)
     db.commit()
     db.refresh(db_plan)
+    versions.bump_plan(db_plan.id)
     return get_garden_plan_by_id(db, plan_id=db_plan.id)
 
 def delete_garden_plan_by_id(db: Session, plan_id: int):
@@ -116,10 +294,12 @@ def delete_garden_plan_by_id(db: Session, plan_id: int):
     if db_plan:
         db.delete(db_plan)
         db.commit()
+        versions.bump_plan(plan_id)
         return True
     return False
 
 def get_most_recent_garden_plan(db: Session):
+    flush_pending_touches(db)
     return (
         db.query(models.GardenPlan)
         .options(*_get_garden_plan_load_options())
@@ -127,79 +307,387 @@ def get_most_recent_garden_plan(db: Session):
         .first()
     )
 
+# Touches waiting to be written when TOUCH_FLUSH_INTERVAL_SECONDS is set, keyed by plan id.
+_pending_touches: Dict[int, datetime] = {}
+_pending_touches_lock = Lock()
+_last_touch_flush = time.monotonic()
+
+def flush_pending_touches(db: Session) -> int:
+    """Writes coalesced touches with one executemany UPDATE and returns how many were written."""
+    global _last_touch_flush
+    with _pending_touches_lock:
+        pending = dict(_pending_touches)
+        _pending_touches.clear()
+        _last_touch_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    plans = models.GardenPlan.__table__
+    db.execute(
+        plans.update().where(plans.c.id == bindparam('b_id')).values(last_accessed_date=bindparam('b_last_accessed_date')),
+        [{'b_id': plan_id, 'b_last_accessed_date': touched_at} for plan_id, touched_at in pending.items()],
+    )
+    db.commit()
+    for plan_id in pending:
+        versions.bump_plan(plan_id)
+    return len(pending)
+
 def touch_garden_plan(db: Session, plan_id: int):
-    db_plan = get_garden_plan_by_id(db, plan_id)
-    if db_plan:
-        db_plan.last_accessed_date = datetime.utcnow()
+    """
+    Records that a plan was opened without loading it. With TOUCH_FLUSH_INTERVAL_SECONDS set,
+    the timestamp is held in memory and written by flush_pending_touches, which also runs
+    before any read that orders plans by last access.
+    """
+    touched_at = datetime.utcnow()
+    if settings.TOUCH_FLUSH_INTERVAL_SECONDS <= 0:
+        updated = db.query(models.GardenPlan).filter(models.GardenPlan.id == plan_id).update(
+            {models.GardenPlan.last_accessed_date: touched_at}, synchronize_session=False
+        )
+        if not updated:
+            return None
         db.commit()
-        db.refresh(db_plan)
-    return db_plan
+        versions.bump_plan(plan_id)
+        return schemas.GardenPlanTouch(id=plan_id, last_accessed_date=touched_at)
+
+    if db.query(models.GardenPlan.id).filter(models.GardenPlan.id == plan_id).first() is None:
+        return None
+    with _pending_touches_lock:
+        _pending_touches[plan_id] = touched_at
+        due = time.monotonic() - _last_touch_flush >= settings.TOUCH_FLUSH_INTERVAL_SECONDS
+    if due:
+        flush_pending_touches(db)
+    return schemas.GardenPlanTouch(id=plan_id, last_accessed_date=touched_at)
 
 # --- Planting CRUD ---
-def get_planting_by_id(db: Session, planting_id: int):
-    return (
-        db.query(models.Planting)
-        .filter(models.Planting.id == planting_id)
-        .first()
+def get_planting_by_id(db: Session, planting_id: int, fields: Optional[FrozenSet[str]] = None):
+    query = db.query(models.Planting)
+    if fields is not None:
+        query = query.options(*_get_planting_load_options(fields))
+    return query.filter(models.Planting.id == planting_id).first()
+
+def detach_plantings(db: Session, plant_ids: Optional[List[int]] = None):
+    """
+    Copies inherited library values into the plantings of the given library plants (or of
+    every plant) so they survive the plants being deleted. Cleared fields stay empty.
+    Does not commit.
+    """
+    plantings = models.Planting.__table__
+    plants = models.Plant.__table__
+    cleared_fields = func.json_each(plantings.c.cleared_fields).table_valued("value")
+    values = {
+        column: case(
+            (select(cleared_fields.c.value).where(cleared_fields.c.value == column).exists(), None),
+            else_=func.coalesce(
+                plantings.c[column],
+                select(plants.c[column]).where(plants.c.id == plantings.c.library_plant_id).scalar_subquery(),
+            ),
+        )
+        for column in LIBRARY_PLANT_COLUMNS
+    }
+    statement = plantings.update().values(values)
+    if plant_ids is not None:
+        statement = statement.where(plantings.c.library_plant_id.in_(plant_ids))
+    db.execute(statement)
+
+# PlantingCreate fields copied straight onto new Planting rows; library fields stay NULL
+# and are inherited from the library plant at read time.
+PLANTING_CREATE_FIELDS = tuple(schemas.PlantingCreate.model_fields)
+
+def _new_planting(garden_plan_id: int, planting_details: schemas.PlantingCreate) -> models.Planting:
+    return models.Planting(
+        garden_plan_id=garden_plan_id,
+        **{field: getattr(planting_details, field) for field in PLANTING_CREATE_FIELDS},
     )
 
 def create_planting(db: Session, garden_plan_id: int, planting_details: schemas.PlantingCreate):
-    library_plant = get_plant_by_id(db, planting_details.library_plant_id)
+    library_plant = plant_cache.get_plant(db, planting_details.library_plant_id)
     if not library_plant:
         return None
 
-    plant_columns = [c.key for c in inspect(models.Plant).attrs if hasattr(models.Planting, c.key) and c.key != 'id']
-    plant_data = {col: getattr(library_plant, col) for col in plant_columns}
-    
-    new_planting = models.Planting(**plant_data)
-    
-    # Set planting-specific fields from the payload
-    new_planting.garden_plan_id = garden_plan_id
-    new_planting.library_plant_id = planting_details.library_plant_id
-    new_planting.quantity = planting_details.quantity
-    new_planting.status = planting_details.status
-    new_planting.planting_method = planting_details.planting_method
-    new_planting.time_to_maturity_override = planting_details.time_to_maturity_override
-    new_planting.planned_sow_date = planting_details.planned_sow_date
-    new_planting.planned_transplant_date = planting_details.planned_transplant_date
-    new_planting.planned_harvest_start_date = planting_details.planned_harvest_start_date
-
+    new_planting = _new_planting(garden_plan_id, planting_details)
     db.add(new_planting)
     db.commit()
+    versions.bump_plan(garden_plan_id)
     db.refresh(new_planting)
         
     return new_planting
 
+def create_plantings_bulk(db: Session, garden_plan_id: int, plantings_details: List[schemas.PlantingCreate]):
+    """
+    Adds several plantings to a plan in one transaction. Returns None without inserting
+    anything if any referenced library plant doesn't exist.
+    """
+    library_plant_ids = {details.library_plant_id for details in plantings_details}
+    found_ids = {
+        plant_id for (plant_id,) in
+        db.query(models.Plant.id).filter(models.Plant.id.in_(library_plant_ids))
+    }
+    if found_ids != library_plant_ids:
+        return None
+
+    # A bulk INSERT ... RETURNING sends the rows in a few multi-row statements rather than
+    # the unit of work's one INSERT per planting.
+    rows = [
+        {"garden_plan_id": garden_plan_id, **details.model_dump(include=set(PLANTING_CREATE_FIELDS))}
+        for details in plantings_details
+    ]
+    new_ids = db.scalars(insert(models.Planting).returning(models.Planting.id), rows).all()
+    db.commit()
+    versions.bump_plan(garden_plan_id)
+
+    return (
+        db.query(models.Planting)
+        .options(selectinload(models.Planting.tasks), selectinload(models.Planting.library_plant))
+        .filter(models.Planting.id.in_(new_ids))
+        .order_by(models.Planting.id)
+        .all()
+    )
+
 def update_planting_by_id(db: Session, planting_id: int, planting_update: schemas.PlantingUpdateSchema):
     db_planting = get_planting_by_id(db, planting_id)
     if db_planting:
         update_data = planting_update.model_dump(exclude_unset=True)
+        library_plant = plant_cache.get_plant(db, db_planting.library_plant_id)
+        cleared_fields = set(db_planting.cleared_fields or ())
         for key, value in update_data.items():
+            if key in LIBRARY_PLANT_COLUMNS and library_plant is not None:
+                # Values equal to the library plant's are stored as NULL so they keep following it;
+                # any other NULL clears the field rather than inheriting it.
+                if value == getattr(library_plant, key):
+                    value = None
+                    cleared_fields.discard(key)
+                elif value is None:
+                    cleared_fields.add(key)
+                else:
+                    cleared_fields.discard(key)
             setattr(db_planting, key, value)
+        db_planting.cleared_fields = sorted(cleared_fields) or None
         db.commit()
         db.refresh(db_planting)
+        versions.bump_plan(db_planting.garden_plan_id)
     return db_planting
 
 def delete_planting_by_id(db: Session, planting_id: int):
     db_planting = get_planting_by_id(db, planting_id)
     if db_planting:
+        plan_id = db_planting.garden_plan_id
         db.delete(db_planting)
         db.commit()
+        versions.bump_plan(plan_id)
         return True
     return False
 
+# --- Task Occurrence Index ---
+# Fields whose change alters the dates or statuses of a task's occurrences.
+OCCURRENCE_FIELDS = {'due_date', 'status', 'recurrence_rule', 'recurrence_end_date', 'completed_dates', 'exdates'}
+
+def _occurrence_horizon() -> Tuple[date, date]:
+    """Returns the rolling date range that reads can be served from the occurrence index."""
+    today = date.today()
+    horizon = timedelta(days=settings.OCCURRENCE_HORIZON_DAYS)
+    return today - horizon, today + horizon
+
+def _materialized_range() -> Tuple[date, date]:
+    """Returns the date range to materialize: the horizon plus slack past its end."""
+    horizon_start, horizon_end = _occurrence_horizon()
+    return horizon_start, horizon_end + timedelta(days=settings.OCCURRENCE_HORIZON_SLACK_DAYS)
+
+def _occurrence_rows(db_task: models.Task, start_date: date, end_date: date, limit: int) -> List[Dict[str, Any]]:
+    """Expands up to `limit` of a task's occurrences within a date range into task_occurrences rows."""
+    return [
+        {'task_id': db_task.id, 'garden_plan_id': db_task.garden_plan_id, 'occurrence_date': occurrence_date, 'status': status}
+        for occurrence_date, status in itertools.islice(recurrence.iter_occurrence_dates(db_task, start_date, end_date), limit)
+    ]
+
+def _materialize_task_occurrences(db: Session, db_task: models.Task) -> bool:
+    """
+    Rebuilds the task_occurrences rows of a task for the current materialized range.
+    A task whose rule cannot be expanded, or that has more occurrences in the horizon
+    than the per-task occurrence budget allows, gets no rows; it is marked unindexed
+    for the horizon so reads expand it directly instead of retrying. Returns False then.
+    """
+    db.query(models.TaskOccurrence).filter(models.TaskOccurrence.task_id == db_task.id).delete(synchronize_session=False)
+    db_task.occurrences_start = None
+    db_task.occurrences_end = None
+    db_task.occurrences_unindexed = False
+    if not db_task.recurrence_rule or not db_task.due_date:
+        return True
+
+    horizon_start, horizon_end = _materialized_range()
+    try:
+        rows = _occurrence_rows(db_task, horizon_start, horizon_end, settings.MAX_OCCURRENCES_PER_TASK + 1)
+    except Exception:
+        rows = None
+    # Oversized tasks are left to expansion, which enforces the budget.
+    indexed = rows is not None and len(rows) <= settings.MAX_OCCURRENCES_PER_TASK
+
+    if indexed and rows:
+        db.execute(insert(models.TaskOccurrence), rows)
+    db_task.occurrences_start = horizon_start
+    db_task.occurrences_end = horizon_end
+    db_task.occurrences_unindexed = not indexed
+    return indexed
+
+def _extend_task_occurrences(db: Session, db_task: models.Task) -> bool:
+    """
+    Rolls a task's materialized rows forward to the current range: rows that fell off
+    the start are deleted and only the days past the old end are expanded. Tasks that
+    aren't indexed, or would outgrow the per-task budget, are rebuilt instead.
+    """
+    range_start, range_end = _materialized_range()
+    if (
+        db_task.occurrences_unindexed
+        or db_task.occurrences_start is None
+        or db_task.occurrences_start > range_start
+        or db_task.occurrences_end < range_start
+    ):
+        return _materialize_task_occurrences(db, db_task)
+
+    occurrences = db.query(models.TaskOccurrence).filter(models.TaskOccurrence.task_id == db_task.id)
+    occurrences.filter(models.TaskOccurrence.occurrence_date < range_start).delete(synchronize_session=False)
+    room = settings.MAX_OCCURRENCES_PER_TASK - occurrences.count()
+    try:
+        rows = _occurrence_rows(db_task, db_task.occurrences_end + timedelta(days=1), range_end, room + 1)
+    except Exception:
+        return _materialize_task_occurrences(db, db_task)
+    if len(rows) > room:
+        return _materialize_task_occurrences(db, db_task)
+
+    if rows:
+        db.execute(insert(models.TaskOccurrence), rows)
+    db_task.occurrences_start = range_start
+    db_task.occurrences_end = range_end
+    return True
+
+def get_indexed_tasks_for_plan(db: Session, plan_id: int, start_date: date, end_date: date):
+    """
+    Reads a plan's tasks for a date range from the materialized occurrence index.
+
+    Returns a tuple of (non-recurring tasks, (task, occurrence_date, status) rows,
+    unindexed recurring tasks the caller should expand itself), or None if the range
+    falls outside the materialized horizon. Occurrence rows are fetched in batches as
+    they are iterated, so the session must stay open until they are consumed.
+    """
+    horizon_start, horizon_end = _occurrence_horizon()
+    if start_date < horizon_start or end_date > horizon_end:
+        return None
+
+    # Roll forward tasks whose materialized range no longer covers the request; with the
+    # slack past the horizon, that happens once every OCCURRENCE_HORIZON_SLACK_DAYS.
+    stale_tasks = (
+        db.query(models.Task)
+        .filter(
+            models.Task.garden_plan_id == plan_id,
+            models.Task.recurrence_rule.isnot(None),
+            models.Task.due_date.isnot(None),
+            or_(
+                models.Task.occurrences_start.is_(None),
+                models.Task.occurrences_start > start_date,
+                models.Task.occurrences_end < end_date,
+            ),
+        )
+        .all()
+    )
+    if stale_tasks:
+        for task in stale_tasks:
+            _extend_task_occurrences(db, task)
+        db.commit()
+
+    one_off_tasks = (
+        db.query(models.Task)
+        .filter(
+            models.Task.garden_plan_id == plan_id,
+            or_(models.Task.recurrence_rule.is_(None), models.Task.due_date.is_(None)),
+            _task_window_filter(start_date, end_date),
+        )
+        .all()
+    )
+    occurrence_rows = (
+        db.query(models.Task, models.TaskOccurrence.occurrence_date, models.TaskOccurrence.status)
+        .join(models.TaskOccurrence, models.TaskOccurrence.task_id == models.Task.id)
+        .filter(
+            models.TaskOccurrence.garden_plan_id == plan_id,
+            models.TaskOccurrence.occurrence_date >= start_date,
+            models.TaskOccurrence.occurrence_date <= end_date,
+        )
+        .order_by(models.TaskOccurrence.occurrence_date, models.TaskOccurrence.task_id)
+        .yield_per(settings.OCCURRENCE_READ_BATCH_SIZE)
+    )
+    unindexed_tasks = (
+        db.query(models.Task)
+        .filter(
+            models.Task.garden_plan_id == plan_id,
+            models.Task.occurrences_unindexed.is_(True),
+            _task_window_filter(start_date, end_date),
+        )
+        .order_by(models.Task.due_date, models.Task.id)
+        .all()
+    )
+    return one_off_tasks, occurrence_rows, unindexed_tasks
+
 # --- Task CRUD ---
 def get_task_by_id(db: Session, task_id: int):
     return _get_by_id(db, models.Task, task_id)
 
-def get_tasks_for_plan(db: Session, plan_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.Task).filter(models.Task.garden_plan_id == plan_id).offset(skip).limit(limit).all()
+def _task_window_filter(start_date: Optional[date], end_date: Optional[date]):
+    """
+    Returns a SQL condition matching tasks that can occur within a date range.
+    Non-recurring tasks are matched on due_date; recurring tasks on the range
+    between their first (due_date) and last possible occurrence.
+    """
+    one_off = [models.Task.recurrence_rule.is_(None)]
+    recurring = [models.Task.recurrence_rule.isnot(None)]
+    if start_date:
+        one_off.append(models.Task.due_date >= start_date)
+        recurring.append(or_(models.Task.last_occurrence_date.is_(None), models.Task.last_occurrence_date >= start_date))
+    if end_date:
+        one_off.append(models.Task.due_date <= end_date)
+        recurring.append(models.Task.due_date <= end_date)
+    return or_(models.Task.due_date.is_(None), and_(*one_off), and_(*recurring))
+
+def _task_keyset_filter(after: Tuple[Optional[date], int]):
+    """
+    Returns a SQL condition matching tasks that sort after a (due_date, id) key.
+    SQLite sorts NULL due dates first, so undated tasks come before every dated one.
+    """
+    due_date, task_id = after
+    if due_date is None:
+        return or_(models.Task.due_date.isnot(None), and_(models.Task.due_date.is_(None), models.Task.id > task_id))
+    return or_(models.Task.due_date > due_date, and_(models.Task.due_date == due_date, models.Task.id > task_id))
+
+def get_tasks_for_plan(db: Session, plan_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None, skip: int = 0, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], int]] = None):
+    """Pages a plan's tasks by (due_date, id); with `after`, the page starts past that key instead of at an offset."""
+    query = (
+        db.query(models.Task)
+        .filter(models.Task.garden_plan_id == plan_id, _task_window_filter(start_date, end_date))
+        .order_by(models.Task.due_date, models.Task.id)
+    )
+    if after is not None:
+        query = query.filter(_task_keyset_filter(after))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def get_tasks_in_date_range(db: Session, start_date: date, end_date: date):
+    """Returns the tasks of every garden plan that can occur within a date range."""
+    return db.query(models.Task).filter(_task_window_filter(start_date, end_date)).all()
+
+def _update_last_occurrence_date(db_task: models.Task):
+    """Stores the last possible occurrence date used to prune tasks by date range."""
+    try:
+        db_task.last_occurrence_date = recurrence.get_last_occurrence_date(db_task)
+    except Exception:
+        db_task.last_occurrence_date = None
 
 def create_task(db: Session, task: schemas.TaskCreate):
     db_task = models.Task(**task.model_dump())
+    _update_last_occurrence_date(db_task)
     db.add(db_task)
+    db.flush()
+    _materialize_task_occurrences(db, db_task)
     db.commit()
     db.refresh(db_task)
+    versions.bump_plan(db_task.garden_plan_id)
     return db_task
 
 def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
@@ -215,26 +703,72 @@ def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
         for key, value in update_data.items():
             setattr(db_task, key, value)
 
+        if OCCURRENCE_FIELDS.intersection(update_data):
+            _update_last_occurrence_date(db_task)
+            _materialize_task_occurrences(db, db_task)
+
         db.commit()
         db.refresh(db_task)
+        versions.bump_plan(db_task.garden_plan_id)
 
     return db_task
 
+def _record_completions(db: Session, completions: List[Tuple[int, date]]):
+    """
+    Records (task_id, completion_date) pairs with one executemany INSERT and marks the
+    matching materialized occurrences completed with one executemany UPDATE.
+    """
+    # The unique constraint makes repeated completions a no-op.
+    db.execute(
+        sqlite_insert(models.TaskOccurrenceState).on_conflict_do_nothing(),
+        [{'task_id': task_id, 'occurrence_date': completion_date, 'kind': models.OccurrenceStateKind.COMPLETED} for task_id, completion_date in completions],
+    )
+    occurrences = models.TaskOccurrence.__table__
+    db.execute(
+        occurrences.update()
+        .where(occurrences.c.task_id == bindparam('b_task_id'), occurrences.c.occurrence_date == bindparam('b_occurrence_date'))
+        .values(status=models.TaskStatus.COMPLETED),
+        [{'b_task_id': task_id, 'b_occurrence_date': completion_date} for task_id, completion_date in completions],
+    )
+
 def complete_task_occurrence(db: Session, task_id: int, completion_date: datetime.date):
     db_task = get_task_by_id(db, task_id)
     if db_task:
-        if db_task.completed_dates is None:
-            db_task.completed_dates = []
-        if completion_date not in db_task.completed_dates:
-            db_task.completed_dates.append(completion_date)
+        _record_completions(db, [(task_id, completion_date)])
         db.commit()
         db.refresh(db_task)
+        versions.bump_plan(db_task.garden_plan_id)
     return db_task
 
+def complete_task_occurrences(db: Session, completions: List[schemas.TaskOccurrenceBatchCompletion]) -> List[schemas.TaskOccurrenceCompletionResult]:
+    """Completes many task occurrences in a single transaction and returns a result per item."""
+    task_ids = {completion.task_id for completion in completions}
+    plan_ids = dict(db.query(models.Task.id, models.Task.garden_plan_id).filter(models.Task.id.in_(task_ids)).all()) if task_ids else {}
+    existing_ids = plan_ids.keys()
+
+    found = [(c.task_id, c.completion_date) for c in completions if c.task_id in existing_ids]
+    if found:
+        _record_completions(db, found)
+        db.commit()
+        for plan_id in {plan_ids[task_id] for task_id, _ in found}:
+            versions.bump_plan(plan_id)
+
+    return [
+        schemas.TaskOccurrenceCompletionResult(
+            task_id=completion.task_id,
+            completion_date=completion.completion_date,
+            success=completion.task_id in existing_ids,
+            detail=None if completion.task_id in existing_ids else "Task not found",
+        )
+        for completion in completions
+    ]
+
 def delete_task(db: Session, task_id: int):
     db_task = get_task_by_id(db, task_id)
     if db_task:
+        plan_id = db_task.garden_plan_id
         db.delete(db_task)
         db.commit()
+        versions.bump_plan(plan_id)
         return True
     return False
\ No newline at end of file
@@ -1,16 +1,22 @@
 # backend/csv_importer.py
 # No changes needed, but provided for completeness.
-import io
+import codecs
 import csv
-from typing import List, Dict, Any, Tuple, Optional
+from typing import BinaryIO, Iterator, List, Dict, Any, Tuple, Optional
 from pydantic import ValidationError
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 import crud
 import schemas
+import versions
+from config import settings
 from models import Plant
 
+# Bytes read from the upload at a time.
+READ_SIZE = 64 * 1024
+
 # A set of keys that are expected to be boolean values
 BOOLEAN_FIELDS = {
     'organic', 'stratification_required', 'scarification_required',
@@ -254,75 +260,174 @@ def process_mapped_csv_import(db: Session, data: List[Dict[str, Any]], mapping:
         errors=total_errors
     )
 
-def process_csv_import(db: Session, content: bytes, mode: str) -> schemas.ImportResult:
-    """Processes a CSV file for import, either appending or replacing data."""
+class _UndecodableUpload(Exception):
+    """Raised by _iter_lines once it reaches bytes that aren't UTF-8."""
+    def __init__(self, lost_lines: int):
+        super().__init__(f"{lost_lines} lines could not be decoded")
+        self.lost_lines = lost_lines
+
+def _count_remaining_lines(head: bytes, file: BinaryIO) -> int:
+    """Counts the non-blank lines in `head` plus the rest of the file, one read at a time."""
+    count = 0
+    pending = head
+    while True:
+        *lines, pending = pending.split(b'\n')
+        count += sum(1 for line in lines if line.strip())
+        chunk = file.read(READ_SIZE)
+        if not chunk:
+            break
+        pending += chunk
+    return count + (1 if pending.strip() else 0)
+
+def _skip_to_next_line(file: BinaryIO) -> bytes:
+    """Reads past the end of the current line and returns whatever follows it in that read."""
+    while chunk := file.read(READ_SIZE):
+        end_of_line = chunk.find(b'\n')
+        if end_of_line != -1:
+            return chunk[end_of_line + 1:]
+    return b''
+
+def _iter_lines(file: BinaryIO) -> Iterator[str]:
+    """
+    Decodes an upload incrementally and yields its lines, newlines included, so the csv
+    module can still join quoted fields that span lines. Only one read's worth of text is
+    held at a time.
+
+    At the first byte that isn't UTF-8, the complete lines before it are still yielded.
+    It then raises _UndecodableUpload with the number of lines that were lost: the line
+    holding that byte and every non-blank line after it.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    pending = ''
+    first_read = True
+    while True:
+        chunk = file.read(READ_SIZE)
+        try:
+            pending += decoder.decode(chunk, final=not chunk)
+        except UnicodeDecodeError as e:
+            # e.object is the decoder's buffered bytes plus this read; e.start is the bad byte.
+            valid = e.object[:e.start].decode('utf-8-sig' if first_read else 'utf-8')
+            *lines, _ = (pending + valid).split('\n')
+            for line in lines:
+                yield line + '\n'
+            rest = e.object[e.start:]
+            end_of_line = rest.find(b'\n')
+            if end_of_line == -1:
+                # The rest of the broken line is in later reads.
+                rest = _skip_to_next_line(file)
+            else:
+                rest = rest[end_of_line + 1:]
+            raise _UndecodableUpload(1 + _count_remaining_lines(rest, file))
+        first_read = False
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line + '\n'
+        if not chunk:
+            break
+    if pending:
+        yield pending
+
+def _insert_rows(db: Session, chunk: List[Tuple[int, Dict[str, Any]]], result: schemas.ImportResult) -> None:
+    """
+    Inserts a chunk of new plants with one executemany INSERT inside a savepoint. If the
+    chunk fails, it is retried row by row, each in its own savepoint, so the error is
+    reported against the offending row and the other rows are kept.
+    """
     try:
-        csv_content = content.decode('utf-8-sig')
-    except UnicodeDecodeError:
-        return schemas.ImportResult(message="Import failed.", errors=["File is not UTF-8 encoded."])
+        with db.begin_nested():
+            db.execute(insert(Plant), [plant_data for _, plant_data in chunk])
+        result.imported_count += len(chunk)
+        return
+    except Exception:
+        pass
+
+    for row_num, plant_data in chunk:
+        try:
+            with db.begin_nested():
+                db.execute(insert(Plant), [plant_data])
+            result.imported_count += 1
+        except IntegrityError as e:
+            result.errors.append(f"Row {row_num}: A database integrity error occurred (e.g., duplicate key): {e.orig}")
+            result.skipped_count += 1
+        except Exception as e:
+            result.errors.append(f"Row {row_num}: An unexpected database error occurred: {e}")
+            result.skipped_count += 1
 
-    reader = csv.DictReader(io.StringIO(csv_content))
-    if not reader.fieldnames:
-        return schemas.ImportResult(message="Import failed.", errors=["CSV is empty or has no headers."])
+def process_csv_import(db: Session, file: BinaryIO, mode: str) -> schemas.ImportResult:
+    """
+    Processes a CSV upload for import, either appending or replacing data. The file is
+    decoded and parsed as a stream and rows are inserted in chunks of
+    settings.CSV_IMPORT_CHUNK_SIZE, so memory use doesn't grow with the file size.
 
-    imported_count = 0
-    updated_count = 0
-    skipped_count = 0
-    total_errors = []
+    Appends commit after every chunk. A replace clears the library and imports the file
+    in a single transaction, so a file that turns out not to be UTF-8 leaves the library
+    untouched.
+    """
+    reader = csv.DictReader(_iter_lines(file))
+    try:
+        fieldnames = reader.fieldnames
+    except _UndecodableUpload:
+        return schemas.ImportResult(message="Import failed.", errors=["File is not UTF-8 encoded."])
+    if not fieldnames:
+        return schemas.ImportResult(message="Import failed.", errors=["CSV is empty or has no headers."])
 
-    if mode == "replace":
+    replace = mode == "replace"
+    if replace:
         try:
+            # Plantings keep their inherited values once the library plants are gone.
+            crud.detach_plantings(db)
             db.query(Plant).delete()
-            db.commit()
         except Exception as e:
             db.rollback()
             return schemas.ImportResult(message="Import failed.", errors=[f"Failed to clear existing data: {e}"])
 
-    for i, row in enumerate(reader):
-        row_num = i + 2
-        
-        mapped_row = {}
-        for header, value in row.items():
-            normalized_header = header.lower().strip() if header else ''
-            if normalized_header in HEADER_MAP:
-                mapped_key = HEADER_MAP[normalized_header]
-                mapped_row[mapped_key] = value
-
-        plant_data, errors = _parse_and_validate_row(mapped_row, row_num)
+    result = schemas.ImportResult(message="CSV import process completed.")
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
 
-        if errors:
-            total_errors.extend(errors)
-        
-        if not plant_data:
-            skipped_count += 1
-            continue
-
-        try:
-            plant_id_str = plant_data.get('id')
-            plant_id = int(plant_id_str) if plant_id_str and plant_id_str.isdigit() else None
+    def save_chunk():
+        _insert_rows(db, chunk, result)
+        chunk.clear()
+        if not replace:
+            db.commit()
+            versions.bump_library()
 
-            if plant_id and (existing_plant := crud.get_plant_by_id(db, plant_id=plant_id)):
-                plant_schema = schemas.PlantUpdate(**plant_data)
-                crud.update_plant_by_id(db, plant_id=existing_plant.id, plant_update=plant_schema)
-                updated_count += 1
-            else:
-                plant_data.pop('id', None)
-                plant_schema = schemas.PlantCreate(**plant_data)
-                crud.create_plant(db, plant=plant_schema)
-                imported_count += 1
-        except IntegrityError as e:
-            db.rollback()
-            total_errors.append(f"Row {row_num}: A database integrity error occurred (e.g., duplicate key): {e.orig}")
-            skipped_count += 1
-        except Exception as e:
+    try:
+        for i, row in enumerate(reader):
+            row_num = i + 2
+
+            mapped_row = {}
+            for header, value in row.items():
+                normalized_header = header.lower().strip() if header else ''
+                if normalized_header in HEADER_MAP:
+                    mapped_key = HEADER_MAP[normalized_header]
+                    mapped_row[mapped_key] = value
+
+            plant_data, errors = _parse_and_validate_row(mapped_row, row_num)
+
+            if errors:
+                result.errors.extend(errors)
+
+            if not plant_data:
+                result.skipped_count += 1
+                continue
+
+            chunk.append((row_num, plant_data))
+            if len(chunk) >= settings.CSV_IMPORT_CHUNK_SIZE:
+                save_chunk()
+    except _UndecodableUpload as e:
+        if replace:
             db.rollback()
-            total_errors.append(f"Row {row_num}: An unexpected database error occurred: {e}")
-            skipped_count += 1
-
-    return schemas.ImportResult(
-        message="CSV import process completed.",
-        imported_count=imported_count,
-        updated_count=updated_count,
-        skipped_count=skipped_count,
-        errors=total_errors
-    )
+            return schemas.ImportResult(
+                message="Import failed.",
+                errors=[f"File is not UTF-8 encoded (line {reader.line_num + 1}); the library was not changed."],
+            )
+        result.skipped_count += e.lost_lines
+        result.errors.append(f"File is not UTF-8 encoded from line {reader.line_num + 1}; {e.lost_lines} remaining lines were skipped.")
+
+    if chunk:
+        save_chunk()
+    if replace:
+        db.commit()
+        versions.bump_library()
+
+    return result
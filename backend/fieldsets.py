@@ -0,0 +1,39 @@
+# backend/fieldsets.py
+"""
+Sparse fieldsets for ?fields= query parameters.
+
+A fieldset is parsed against a response schema, turned into load_only() columns so only
+those columns are selected, and serialized through a trimmed copy of the schema.
+"""
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Type
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[FrozenSet[str]]:
+    """
+    Parses a comma-separated field list, always including 'id'. Returns None when no
+    fields were requested; raises ValueError naming any fields the schema doesn't have.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return frozenset(requested | {"id"})
+
+@lru_cache(maxsize=None)
+def partial_schema(schema: Type[BaseModel], fields: FrozenSet[str], base: Optional[Type[BaseModel]] = None) -> Type[BaseModel]:
+    """
+    Returns a copy of the schema with only the given fields, cached per fieldset. Validators
+    are not copied; pass a field-less base that carries them (and from_attributes) instead.
+    """
+    field_definitions = {name: (field.annotation, field) for name, field in schema.model_fields.items() if name in fields}
+    if base is not None:
+        return create_model(f"{schema.__name__}Partial", __base__=base, **field_definitions)
+    return create_model(f"{schema.__name__}Partial", __config__=ConfigDict(from_attributes=True), **field_definitions)
+
+def load_only_columns(model, fields: FrozenSet[str]) -> List:
+    """Returns the mapped column attributes of a model named in a fieldset, for load_only()."""
+    return [getattr(model, column.key) for column in inspect(model).column_attrs if column.key in fields]
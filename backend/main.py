@@ -1,10 +1,15 @@
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import datetime
 from zoneinfo import ZoneInfo
 import models
-from database import engine
-from routers import plants, garden_plans, plantings, tasks, task_groups
+import crud
+import recurrence
+from config import settings
+from database import engine, SessionLocal
+from routers import plants, garden_plans, plantings, tasks, task_groups, calendar
 from version import __version__
 
 models.Base.metadata.create_all(bind=engine)
@@ -14,6 +19,37 @@ app = FastAPI()
 la_tz = ZoneInfo('America/Los_Angeles')
 build_date = datetime.datetime.now(la_tz).strftime("%Y-%m-%d %H:%M:%S %Z")
 
+@app.on_event("startup")
+def start_recurrence_workers():
+    recurrence.start_executor()
+
+@app.on_event("shutdown")
+def shutdown_recurrence_workers():
+    recurrence.shutdown_executor()
+
+def flush_touches():
+    db = SessionLocal()
+    try:
+        crud.flush_pending_touches(db)
+    finally:
+        db.close()
+
+async def flush_touches_periodically():
+    while True:
+        await asyncio.sleep(settings.TOUCH_FLUSH_INTERVAL_SECONDS)
+        await run_in_threadpool(flush_touches)
+
+@app.on_event("startup")
+async def start_touch_flusher():
+    if settings.TOUCH_FLUSH_INTERVAL_SECONDS > 0:
+        app.state.touch_flusher = asyncio.create_task(flush_touches_periodically())
+
+@app.on_event("shutdown")
+def shutdown_touch_flusher():
+    if getattr(app.state, "touch_flusher", None):
+        app.state.touch_flusher.cancel()
+    flush_touches()
+
 @app.get("/version")
 def read_version():
     return {"version": __version__, "build_date": build_date}
@@ -24,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Truncated-Tasks"],
 )
 
 app.include_router(plants.router)
@@ -31,3 +68,4 @@ app.include_router(garden_plans.router)
 app.include_router(plantings.router)
 app.include_router(tasks.router)
 app.include_router(task_groups.router)
+app.include_router(calendar.router)
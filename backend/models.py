@@ -1,25 +1,27 @@
 # backend/models.py
 # Removed PlantingGroup and added quantity to Planting.
-from sqlalchemy import Boolean, Integer, String, Date, Float, ForeignKey, Enum, DateTime, func, JSON
+from sqlalchemy import DDL, event, JSON, Boolean, Integer, String, Date, ForeignKey, Enum, DateTime, func, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 import enum
 
 from database import Base
 
 class Plant(Base):
     __tablename__ = "plants"
+    # Plantings keep their library_plant_id after the plant is deleted, so ids must never be reused.
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     plant_name: Mapped[str] = mapped_column(String, index=True)
     variety_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     scientific_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    plant_family: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    plant_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    plant_family: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
+    plant_type: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
     growth_habit: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     origin_heirloom_status: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    organic: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
+    organic: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True, index=True)
     seed_company_source: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     year_acquired: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     seed_size: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -35,15 +37,15 @@ class Plant(Base):
     spacing_in_row: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     spacing_low: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     spacing_high: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    direct_seedable: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
-    transplantable: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
+    direct_seedable: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True, index=True)
+    transplantable: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True, index=True)
     days_to_transplant_low: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     days_to_transplant_high: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     time_to_maturity: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     mature_plant_height: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     mature_plant_spread_width: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    sunlight_requirement: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    water_needs: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    sunlight_requirement: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
+    water_needs: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
     fertilizer_needs: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     pest_resistance: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     disease_resistance: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -63,6 +65,30 @@ class Plant(Base):
     url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     weekly_yield: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
+# --- Plant full-text search ---
+# plants_fts is an FTS5 index over the plants table (external content, so the text isn't
+# stored twice). Triggers keep it in sync with every write path, ORM or not.
+PLANT_SEARCH_COLUMNS = ["plant_name", "variety_name", "scientific_name", "plant_family", "seed_company_source", "notes_observations"]
+
+def _plant_search_ddl() -> List[str]:
+    columns = ", ".join(PLANT_SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in PLANT_SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in PLANT_SEARCH_COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS plants_fts USING fts5({columns}, content='plants', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS plants_fts_insert AFTER INSERT ON plants BEGIN "
+        f"INSERT INTO plants_fts(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS plants_fts_delete AFTER DELETE ON plants BEGIN "
+        f"INSERT INTO plants_fts(plants_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS plants_fts_update AFTER UPDATE ON plants BEGIN "
+        f"INSERT INTO plants_fts(plants_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO plants_fts(rowid, {columns}) VALUES (new.id, {new_values}); END",
+    ]
+
+for _statement in _plant_search_ddl():
+    event.listen(Plant.__table__, "after_create", DDL(_statement))
+event.listen(Plant.__table__, "before_drop", DDL("DROP TABLE IF EXISTS plants_fts"))
+
 class GardenPlan(Base):
     __tablename__ = "garden_plans"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -112,15 +138,18 @@ class Planting(Base):
     planned_second_harvest_date: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True)
     time_to_maturity_override: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
-    # --- Fields copied from Plant library record at creation time ---
-    plant_name: Mapped[str] = mapped_column(String, index=True)
+    # --- Per-planting overrides of the library plant's fields ---
+    # NULL means the value is inherited from the library plant through library_plant_id,
+    # unless the field is listed in cleared_fields, which the user set to empty on purpose.
+    cleared_fields: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
+    plant_name: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True)
     variety_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     scientific_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     plant_family: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     plant_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     growth_habit: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     origin_heirloom_status: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    organic: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
+    organic: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
     seed_company_source: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     year_acquired: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     seed_size: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -130,14 +159,14 @@ class Planting(Base):
     germination_temperature_ideal: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     germination_time_days: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     light_requirement_for_germination: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    stratification_required: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
-    scarification_required: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
+    stratification_required: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    scarification_required: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
     sowing_depth: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     spacing_in_row: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     spacing_low: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     spacing_high: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    direct_seedable: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
-    transplantable: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
+    direct_seedable: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    transplantable: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
     days_to_transplant_low: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     days_to_transplant_high: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     time_to_maturity: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -159,13 +188,14 @@ class Planting(Base):
     typical_yield: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     yield_units: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     storage_life_post_harvest: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    requires_pollinator: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
+    requires_pollinator: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
     notes_observations: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     weekly_yield: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     
     # --- Relationships ---
     garden_plan: Mapped["GardenPlan"] = relationship(back_populates="plantings")
+    library_plant: Mapped[Optional["Plant"]] = relationship()
     tasks: Mapped[List["Task"]] = relationship(back_populates="planting", cascade="all, delete-orphan")
 
 class TaskStatus(str, enum.Enum):
@@ -180,10 +210,13 @@ class TaskGroup(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_plan_due_date", "garden_plan_id", "due_date"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     garden_plan_id: Mapped[int] = mapped_column(ForeignKey("garden_plans.id", ondelete="CASCADE"))
     planting_id: Mapped[Optional[int]] = mapped_column(ForeignKey("plantings.id"), nullable=True)
-    task_group_id: Mapped[Optional[int]] = mapped_column(ForeignKey("task_groups.id"), nullable=True)
+    task_group_id: Mapped[Optional[int]] = mapped_column(ForeignKey("task_groups.id"), nullable=True, index=True)
     name: Mapped[str] = mapped_column(String)
     description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     due_date: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True)
@@ -192,9 +225,76 @@ class Task(Base):
     # --- Recurrence Info ---
     recurrence_rule: Mapped[Optional[str]] = mapped_column(String, nullable=True) # Storing the RRULE string
     recurrence_end_date: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True)
-    completed_dates: Mapped[Optional[List[datetime]]] = mapped_column(JSON, nullable=True) # List of completed dates
-    exdates: Mapped[Optional[List[datetime]]] = mapped_column(JSON, nullable=True) # List of exception dates
+    last_occurrence_date: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True) # Computed on write; NULL if unbounded
+
+    # --- Materialized occurrence horizon (date range covered by task_occurrences) ---
+    occurrences_start: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True)
+    occurrences_end: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True)
+    occurrences_unindexed: Mapped[bool] = mapped_column(Boolean, default=False, server_default="0", nullable=False) # Too many occurrences or an invalid rule; expanded on read
 
     garden_plan: Mapped["GardenPlan"] = relationship(back_populates="tasks")
     planting: Mapped[Optional["Planting"]] = relationship(back_populates="tasks")
     task_group: Mapped[Optional["TaskGroup"]] = relationship(back_populates="tasks")
+    occurrences: Mapped[List["TaskOccurrence"]] = relationship(back_populates="task", cascade="all, delete-orphan")
+    occurrence_states: Mapped[List["TaskOccurrenceState"]] = relationship(back_populates="task", cascade="all, delete-orphan", lazy="selectin")
+
+    # --- Per-occurrence state, exposed as date lists to keep the API shape ---
+    def _get_state_dates(self, kind: "OccurrenceStateKind") -> List[date]:
+        return sorted(state.occurrence_date for state in self.occurrence_states if state.kind == kind)
+
+    def _set_state_dates(self, kind: "OccurrenceStateKind", dates: Optional[List[date]]) -> None:
+        new_dates = set(dates or [])
+        for state in [s for s in self.occurrence_states if s.kind == kind]:
+            if state.occurrence_date in new_dates:
+                new_dates.discard(state.occurrence_date)
+            else:
+                self.occurrence_states.remove(state)
+        for occurrence_date in sorted(new_dates):
+            self.occurrence_states.append(TaskOccurrenceState(occurrence_date=occurrence_date, kind=kind))
+
+    @property
+    def completed_dates(self) -> List[date]:
+        return self._get_state_dates(OccurrenceStateKind.COMPLETED)
+
+    @completed_dates.setter
+    def completed_dates(self, dates: Optional[List[date]]) -> None:
+        self._set_state_dates(OccurrenceStateKind.COMPLETED, dates)
+
+    @property
+    def exdates(self) -> List[date]:
+        return self._get_state_dates(OccurrenceStateKind.EXCLUDED)
+
+    @exdates.setter
+    def exdates(self, dates: Optional[List[date]]) -> None:
+        self._set_state_dates(OccurrenceStateKind.EXCLUDED, dates)
+
+class OccurrenceStateKind(str, enum.Enum):
+    COMPLETED = "Completed"
+    EXCLUDED = "Excluded"
+
+class TaskOccurrenceState(Base):
+    """The state of a single occurrence of a recurring task: completed or excluded (exdate)."""
+    __tablename__ = "task_occurrence_states"
+    __table_args__ = (
+        UniqueConstraint("task_id", "occurrence_date", "kind", name="uq_task_occurrence_states_task_date_kind"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"))
+    occurrence_date: Mapped[datetime] = mapped_column(Date)
+    kind: Mapped[OccurrenceStateKind] = mapped_column(Enum(OccurrenceStateKind))
+
+    task: Mapped["Task"] = relationship(back_populates="occurrence_states")
+
+class TaskOccurrence(Base):
+    """A materialized occurrence of a recurring task, maintained on write for a rolling horizon."""
+    __tablename__ = "task_occurrences"
+    __table_args__ = (
+        Index("ix_task_occurrences_plan_date", "garden_plan_id", "occurrence_date"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
+    garden_plan_id: Mapped[int] = mapped_column(ForeignKey("garden_plans.id", ondelete="CASCADE"))
+    occurrence_date: Mapped[datetime] = mapped_column(Date)
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), default=TaskStatus.PENDING)
+
+    task: Mapped["Task"] = relationship(back_populates="occurrences")
@@ -0,0 +1,47 @@
+# backend/pagination.py
+"""
+Opaque cursors for keyset pagination.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and base64url-wrapped so
+clients treat it as a token. The next page starts strictly after that key, which keeps
+every page an index range scan no matter how deep the client has paged.
+"""
+import base64
+import json
+from datetime import date
+from typing import Any, List, Optional, Tuple
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(*values: Any) -> str:
+    payload = json.dumps([value.isoformat() if isinstance(value, date) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decodes a cursor into its key values; raises ValueError for malformed tokens."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+def decode_plant_cursor(cursor: str) -> Tuple[str, int]:
+    """Decodes a (plant_name, id) cursor."""
+    values = decode_cursor(cursor)
+    if len(values) != 2 or not isinstance(values[0], str) or not isinstance(values[1], int):
+        raise ValueError("Invalid cursor")
+    return values[0], values[1]
+
+def decode_task_cursor(cursor: str) -> Tuple[Optional[date], int]:
+    """Decodes a (due_date, id) cursor; due_date is None for tasks without one."""
+    values = decode_cursor(cursor)
+    if len(values) != 2 or not isinstance(values[1], int) or not (values[0] is None or isinstance(values[0], str)):
+        raise ValueError("Invalid cursor")
+    try:
+        due_date = date.fromisoformat(values[0]) if values[0] is not None else None
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+    return due_date, values[1]
@@ -0,0 +1,112 @@
+# backend/plant_cache.py
+"""
+An in-process cache of the plant library.
+
+The whole library is loaded once, ordered like GET /plants/, and kept as validated
+schemas.Plant rows plus each row's pre-encoded JSON. A snapshot is tied to the library
+version from the versions module, so every crud write that bumps the library version
+(and the CSV importers, which write through crud) makes the next read reload it.
+"""
+import bisect
+from threading import Lock
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+import versions
+
+class PlantCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    version: Optional[int]
+    currsize: int
+
+class _Snapshot(NamedTuple):
+    version: int
+    plants: List[schemas.Plant]
+    by_id: Dict[int, schemas.Plant]
+    encoded: List[bytes]
+    keys: List[Tuple[str, int]]
+
+_snapshot: Optional[_Snapshot] = None
+_lock = Lock()
+_hits = 0
+_misses = 0
+
+def _load(db: Session) -> _Snapshot:
+    # Read the version first: a write racing with the load leaves the snapshot already stale.
+    version = versions.library_version()
+    plants = [
+        schemas.Plant.model_validate(db_plant)
+        for db_plant in db.query(models.Plant).order_by(models.Plant.plant_name, models.Plant.id).all()
+    ]
+    return _Snapshot(
+        version=version,
+        plants=plants,
+        by_id={plant.id: plant for plant in plants},
+        encoded=[plant.model_dump_json().encode() for plant in plants],
+        keys=[(plant.plant_name, plant.id) for plant in plants],
+    )
+
+def _get_snapshot(db: Session) -> _Snapshot:
+    global _snapshot, _hits, _misses
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.version == versions.library_version():
+            _hits += 1
+            return snapshot
+        _misses += 1
+
+    # Load outside the lock; concurrent misses just load the library twice.
+    snapshot = _load(db)
+    with _lock:
+        _snapshot = snapshot
+    return snapshot
+
+def _filter_keys(snapshot: _Snapshot, filters: Optional[Dict[str, FrozenSet[Any]]]) -> Tuple[List[Tuple[str, int]], Sequence[int]]:
+    """
+    Returns the (plant_name, id) keys and snapshot positions of the plants matching every
+    filter; each filter maps a column to the values it accepts.
+    """
+    if not filters:
+        return snapshot.keys, range(len(snapshot.keys))
+    positions = [
+        position for position, plant in enumerate(snapshot.plants)
+        if all(getattr(plant, column) in values for column, values in filters.items())
+    ]
+    return [snapshot.keys[position] for position in positions], positions
+
+def _page(keys: List[Tuple[str, int]], skip: int, limit: int, after: Optional[Tuple[str, int]]) -> Tuple[slice, Optional[Tuple[str, int]]]:
+    """Returns the slice of a page and the (plant_name, id) key of its last row if more rows follow."""
+    start = bisect.bisect_right(keys, after) if after is not None else skip
+    end = start + limit
+    return slice(start, end), keys[end - 1] if end < len(keys) else None
+
+def get_plants_json(db: Session, skip: int = 0, limit: int = 1000, after: Optional[Tuple[str, int]] = None, filters: Optional[Dict[str, FrozenSet[Any]]] = None) -> Tuple[bytes, Optional[Tuple[str, int]]]:
+    """
+    Returns a page of the library as a JSON array, joined from the pre-encoded rows, and
+    the (plant_name, id) key of its last row if more rows follow. A page starts after the
+    given key when one is passed, otherwise at the skip offset.
+    """
+    snapshot = _get_snapshot(db)
+    keys, positions = _filter_keys(snapshot, filters)
+    page, next_key = _page(keys, skip, limit, after)
+    return b"[" + b",".join(snapshot.encoded[position] for position in positions[page]) + b"]", next_key
+
+def get_plants_fields(db: Session, fields: FrozenSet[str], skip: int = 0, limit: int = 1000, after: Optional[Tuple[str, int]] = None, filters: Optional[Dict[str, FrozenSet[Any]]] = None) -> Tuple[List[dict], Optional[Tuple[str, int]]]:
+    """Like get_plants_json, but projects each cached row onto a sparse fieldset."""
+    snapshot = _get_snapshot(db)
+    keys, positions = _filter_keys(snapshot, filters)
+    page, next_key = _page(keys, skip, limit, after)
+    return [snapshot.plants[position].model_dump(mode="json", include=fields) for position in positions[page]], next_key
+
+def get_plant(db: Session, plant_id: int) -> Optional[schemas.Plant]:
+    return _get_snapshot(db).by_id.get(plant_id)
+
+def cache_info() -> PlantCacheInfo:
+    """Returns hit/miss counters, the cached library version and the number of cached plants."""
+    with _lock:
+        if _snapshot is None:
+            return PlantCacheInfo(_hits, _misses, None, 0)
+        return PlantCacheInfo(_hits, _misses, _snapshot.version, len(_snapshot.plants))
@@ -1,37 +1,471 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import List
-from dateutil.rrule import rrulestr, rrule
+from functools import lru_cache
+from itertools import repeat
+from threading import Lock
+import heapq
+import itertools
+import multiprocessing
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from dateutil.rrule import rrulestr, rrule, rruleset
+import numpy as np
+from config import settings
 from schemas import Task, TaskStatus
 
-def get_occurrences(task: Task, start_date: date, end_date: date) -> List[Task]:
+class RuleCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class _RuleCache:
     """
-    Generates a list of task occurrences for a given recurring task within a date range.
+    A bounded LRU cache of compiled recurrence rules, keyed by the normalized
+    rule string and dtstart. Editing a task's rule or due date changes its key, so
+    entries never go stale; old ones simply age out.
     """
-    if not task.recurrence_rule or not task.due_date:
-        return [task]
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._rules: "OrderedDict[Tuple[str, datetime], Union[rrule, rruleset]]" = OrderedDict()
+        self._lock = Lock()
 
-    # Sanitize rule string to remove 'Z' from UNTIL, ensuring it is treated as naive
-    # to match the naive dtstart derived from task.due_date.
-    rule_string = task.recurrence_rule.replace('Z', '')
-    rule = rrulestr(rule_string, dtstart=datetime.combine(task.due_date, datetime.min.time()))
-    occurrences = []
+    def get(self, rule_string: str, dtstart: datetime) -> Union[rrule, rruleset]:
+        key = (rule_string, dtstart)
+        with self._lock:
+            rule = self._rules.get(key)
+            if rule is not None:
+                self._rules.move_to_end(key)
+                self.hits += 1
+                return rule
+            self.misses += 1
+
+        # Parse outside the lock; a concurrent miss on the same key just compiles it twice.
+        rule = rrulestr(rule_string, dtstart=dtstart)
+
+        with self._lock:
+            self._rules[key] = rule
+            self._rules.move_to_end(key)
+            while len(self._rules) > self.maxsize:
+                self._rules.popitem(last=False)
+        return rule
+
+    def info(self) -> RuleCacheInfo:
+        with self._lock:
+            return RuleCacheInfo(self.hits, self.misses, self.maxsize, len(self._rules))
+
+_rule_cache = _RuleCache(settings.RRULE_CACHE_SIZE)
+
+def normalize_rule(rule_string: str) -> str:
+    """
+    Sanitizes a rule string by removing 'Z' from UNTIL, ensuring it is treated as naive
+    to match the naive dtstart derived from task.due_date.
+    """
+    return rule_string.replace('Z', '').strip()
+
+def get_rule(task: Task) -> Union[rrule, rruleset]:
+    """Returns the compiled recurrence rule for a task, using the LRU cache."""
+    dtstart = datetime.combine(task.due_date, datetime.min.time())
+    return _rule_cache.get(normalize_rule(task.recurrence_rule), dtstart)
+
+def rule_cache_info() -> RuleCacheInfo:
+    """Returns hit/miss counters and the current size of the compiled rule cache."""
+    return _rule_cache.info()
+
+# --- Vectorized fast path for simple rules ---
+WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+SIMPLE_RULE_PARTS = {
+    'DAILY': {'FREQ', 'INTERVAL', 'BYDAY', 'UNTIL', 'COUNT'},
+    'WEEKLY': {'FREQ', 'INTERVAL', 'BYDAY', 'UNTIL', 'COUNT', 'WKST'},
+    'MONTHLY': {'FREQ', 'INTERVAL', 'UNTIL', 'COUNT'},
+}
+
+class SimpleRule(NamedTuple):
+    freq: str
+    interval: int
+    weekdays: Optional[Tuple[int, ...]]
+    until: Optional[date]
+    count: Optional[int]
+    wkst: int
+
+@lru_cache(maxsize=1024)
+def parse_simple_rule(rule_string: str) -> Optional[SimpleRule]:
+    """
+    Parses FREQ=DAILY|WEEKLY|MONTHLY rules with INTERVAL, plain BYDAY, UNTIL, COUNT
+    and WKST. Returns None for anything else, which must go through dateutil.
+    """
+    if '\n' in rule_string:
+        return None
+    if rule_string.upper().startswith('RRULE:'):
+        rule_string = rule_string[len('RRULE:'):]
+
+    parts = {}
+    for part in rule_string.upper().split(';'):
+        if not part:
+            continue
+        name, _, value = part.partition('=')
+        if not value or name in parts:
+            return None
+        parts[name] = value
+
+    freq = parts.get('FREQ')
+    if freq not in SIMPLE_RULE_PARTS or not set(parts) <= SIMPLE_RULE_PARTS[freq]:
+        return None
+
+    try:
+        interval = int(parts.get('INTERVAL', 1))
+        count = int(parts['COUNT']) if 'COUNT' in parts else None
+        until = datetime.strptime(parts['UNTIL'][:8], '%Y%m%d').date() if 'UNTIL' in parts else None
+        weekdays = tuple(sorted({WEEKDAYS[day] for day in parts['BYDAY'].split(',')})) if 'BYDAY' in parts else None
+        wkst = WEEKDAYS[parts.get('WKST', 'MO')]
+    except (KeyError, ValueError):
+        return None
+    if interval < 1 or (count is not None and count < 0):
+        return None
+    return SimpleRule(freq, interval, weekdays, until, count, wkst)
+
+def _weekday(dates: np.ndarray) -> np.ndarray:
+    """Monday=0 weekday of datetime64[D] values (1970-01-01 was a Thursday)."""
+    return (dates.astype(np.int64) + 3) % 7
 
-    # Iterate through occurrences and create virtual tasks
-    for occurrence_dt in rule.between(datetime.combine(start_date, datetime.min.time()), datetime.combine(end_date, datetime.max.time()), inc=True):
+def _simple_rule_dates(rule: SimpleRule, dtstart: date, start_date: date, end_date: date) -> np.ndarray:
+    """Builds the occurrence dates of a simple rule within a date range as datetime64[D]."""
+    if rule.until:
+        end_date = min(end_date, rule.until)
+    first = np.datetime64(dtstart, 'D')
+    end = np.datetime64(end_date, 'D')
+    # COUNT is measured from dtstart, so counted rules are generated from the beginning.
+    low = first if rule.count is not None else max(first, np.datetime64(start_date, 'D'))
+    if end < low:
+        return np.empty(0, dtype='datetime64[D]')
+
+    if rule.freq == 'MONTHLY':
+        first_month = np.datetime64(dtstart, 'M')
+        months_from_start = (np.datetime64(low, 'M') - first_month).astype(np.int64)
+        months_to_end = (np.datetime64(end, 'M') - first_month).astype(np.int64)
+        steps = np.arange(months_from_start // rule.interval, months_to_end // rule.interval + 1)
+        months = first_month + steps * rule.interval
+        month_starts = months.astype('datetime64[D]')
+        days_in_month = ((months + 1).astype('datetime64[D]') - month_starts).astype(np.int64)
+        # Months without the start day (e.g. the 31st) are skipped, as dateutil does.
+        dates = month_starts[days_in_month >= dtstart.day] + (dtstart.day - 1)
+    elif rule.freq == 'WEEKLY' and rule.weekdays:
+        period = 7 * rule.interval
+        week_start = first - (dtstart.weekday() - rule.wkst) % 7
+        offsets = np.array(sorted((day - rule.wkst) % 7 for day in rule.weekdays))
+        weeks = week_start + np.arange(
+            max(0, ((low - week_start).astype(np.int64) - 6) // period),
+            (end - week_start).astype(np.int64) // period + 1,
+        ) * period
+        dates = (weeks[:, None] + offsets[None, :]).ravel()
+    else:
+        period = 7 * rule.interval if rule.freq == 'WEEKLY' else rule.interval
+        dates = first + np.arange(
+            -(-(low - first).astype(np.int64) // period),
+            (end - first).astype(np.int64) // period + 1,
+        ) * period
+        if rule.weekdays:
+            dates = dates[np.isin(_weekday(dates), rule.weekdays)]
+
+    dates = dates[(dates >= first) & (dates <= end)]
+    if rule.count is not None:
+        dates = dates[:rule.count]
+    return dates[dates >= np.datetime64(start_date, 'D')]
+
+def _iter_simple_occurrence_dates(rule: SimpleRule, base: Task, start_date: date, end_date: date) -> Iterator[Tuple[date, TaskStatus]]:
+    dates = _simple_rule_dates(rule, base.due_date, start_date, end_date)
+    # Remove exdates and flag completed dates with vectorized set operations.
+    if base.exdates:
+        dates = dates[~np.isin(dates, np.array(base.exdates, dtype='datetime64[D]'))]
+    completed = np.zeros(len(dates), dtype=bool)
+    if base.completed_dates:
+        completed = np.isin(dates, np.array(base.completed_dates, dtype='datetime64[D]'))
+
+    for occurrence_date, is_completed in zip(dates.tolist(), completed.tolist()):
+        yield occurrence_date, TaskStatus.COMPLETED if is_completed else base.status
+
+def _iter_occurrence_dates(base: Task, start_date: date, end_date: date) -> Iterator[Tuple[date, TaskStatus]]:
+    if base.recurrence_end_date:
+        end_date = min(end_date, base.recurrence_end_date)
+
+    simple_rule = parse_simple_rule(normalize_rule(base.recurrence_rule))
+    if simple_rule is not None:
+        yield from _iter_simple_occurrence_dates(simple_rule, base, start_date, end_date)
+        return
+
+    rule = get_rule(base)
+    exdates = set(base.exdates or ())
+    completed_dates = set(base.completed_dates or ())
+    range_end = datetime.combine(end_date, datetime.max.time())
+
+    for occurrence_dt in rule.xafter(datetime.combine(start_date, datetime.min.time()), inc=True):
+        if occurrence_dt > range_end:
+            break
         occurrence_date = occurrence_dt.date()
 
         # Skip exdates
-        if task.exdates and occurrence_date in task.exdates:
+        if occurrence_date in exdates:
             continue
 
-        # Create a new task instance for the occurrence
-        occurrence_task = Task.model_validate(task)
-        occurrence_task.due_date = occurrence_date
-
         # Set status to COMPLETED if the date is in completed_dates
-        if task.completed_dates and occurrence_date in task.completed_dates:
-            occurrence_task.status = TaskStatus.COMPLETED
+        if occurrence_date in completed_dates:
+            yield occurrence_date, TaskStatus.COMPLETED
+        else:
+            yield occurrence_date, base.status
+
+def get_last_occurrence_date(task: Task) -> Optional[date]:
+    """
+    Returns an upper bound on the last date a task can occur, or None if its recurrence
+    is unbounded.
+
+    The bound is the rule's UNTIL date, or for a COUNT rule its last occurrence, capped
+    by recurrence_end_date. Rules are never walked further than the per-task occurrence
+    budget, so rule sets (multiple RRULE or RDATE lines) and larger counts are treated
+    as unbounded.
+    """
+    if not task.recurrence_rule or not task.due_date:
+        return task.due_date
+
+    last_date = None
+    rule = get_rule(task)
+    if isinstance(rule, rrule):
+        if rule._until is not None:
+            last_date = rule._until.date()
+        elif rule._count is not None and rule._count <= settings.MAX_OCCURRENCES_PER_TASK:
+            last_date = task.due_date
+            for occurrence_dt in rule:
+                last_date = occurrence_dt.date()
+
+    if task.recurrence_end_date:
+        last_date = min(last_date, task.recurrence_end_date) if last_date else task.recurrence_end_date
+    return last_date
+
+def iter_occurrence_dates(task: Task, start_date: date, end_date: date) -> Iterator[Tuple[date, TaskStatus]]:
+    """Yields (date, status) pairs for the occurrences of a recurring task within a date range."""
+    if not task.recurrence_rule or not task.due_date:
+        return iter(())
+    return _iter_occurrence_dates(Task.model_validate(task), start_date, end_date)
+
+def iter_occurrences(task: Task, start_date: date, end_date: date) -> Iterator[Task]:
+    """
+    Lazily yields the occurrences of a recurring task within a date range, one at a time.
+
+    The parent task is validated once; each occurrence is a shallow copy of it that
+    only overrides due_date and status, sharing the rest of the validated data.
+    """
+    if not task.recurrence_rule or not task.due_date:
+        yield task
+        return
+
+    base = Task.model_validate(task)
+    for occurrence_date, status in _iter_occurrence_dates(base, start_date, end_date):
+        yield base.model_copy(update={'due_date': occurrence_date, 'status': status})
+
+def iter_next_occurrences(task: Task, reference_date: date, count: int) -> Iterator[Task]:
+    """
+    Yields the next `count` due occurrences of a recurring task on or after a reference date.
+
+    Occurrences are pulled lazily from the rule, so the cost is proportional to `count`
+    rather than to a date window. Excluded and already completed dates are skipped.
+    """
+    if not task.recurrence_rule or not task.due_date:
+        yield task
+        return
+
+    base = Task.model_validate(task)
+    rule = get_rule(base)
+    skipped_dates = set(base.exdates or ()) | set(base.completed_dates or ())
+    remaining = count
+
+    for occurrence_dt in rule.xafter(datetime.combine(reference_date, datetime.min.time()), inc=True):
+        occurrence_date = occurrence_dt.date()
+        if base.recurrence_end_date and occurrence_date > base.recurrence_end_date:
+            break
+        if occurrence_date in skipped_dates:
+            continue
+        yield base.model_copy(update={'due_date': occurrence_date})
+        remaining -= 1
+        if remaining <= 0:
+            break
+
+def iter_materialized_occurrences(rows: Iterable[Tuple[Task, date, TaskStatus]]) -> Iterator[Task]:
+    """
+    Builds virtual tasks from (task, occurrence_date, status) rows read from the
+    materialized occurrence table, validating each parent task only once.
+    """
+    bases: Dict[int, Task] = {}
+    for task, occurrence_date, status in rows:
+        base = bases.get(task.id)
+        if base is None:
+            base = bases[task.id] = Task.model_validate(task)
+        yield base.model_copy(update={'due_date': occurrence_date, 'status': status})
+
+# --- Occurrence budget ---
+_budget_hits = 0
+_budget_lock = Lock()
+
+def _record_budget_hit() -> None:
+    global _budget_hits
+    with _budget_lock:
+        _budget_hits += 1
+
+def budget_info() -> Dict[str, int]:
+    """Returns how many times a task's expansion has been cut short by an occurrence budget."""
+    with _budget_lock:
+        return {'truncations': _budget_hits}
+
+class OccurrenceBudget:
+    """
+    Limits how many occurrences a single request may expand, per task and in total,
+    and records which tasks were truncated.
+    """
+    def __init__(self, per_task: Optional[int] = None, per_request: Optional[int] = None):
+        self.per_task = settings.MAX_OCCURRENCES_PER_TASK if per_task is None else per_task
+        self.remaining = settings.MAX_OCCURRENCES_PER_REQUEST if per_request is None else per_request
+        self.truncated_task_ids: List[int] = []
+
+    def truncate(self, task_id: int) -> None:
+        if task_id not in self.truncated_task_ids:
+            self.truncated_task_ids.append(task_id)
+            _record_budget_hit()
+
+    def limit(self, task_id: int, occurrences: Iterable[Task]) -> Iterator[Task]:
+        """Yields a task's occurrences until either budget runs out, then stops expanding."""
+        allowed = min(self.per_task, self.remaining)
+        for count, occurrence in enumerate(occurrences):
+            if count >= allowed:
+                self.truncate(task_id)
+                return
+            self.remaining -= 1
+            yield occurrence
+
+    def limit_total(self, tasks: Iterable[Task]) -> Iterator[Task]:
+        """
+        Applies the per-request budget to an already expanded stream of tasks, such as
+        rows read from the materialized occurrence table. Non-recurring tasks pass through.
+        """
+        for task in tasks:
+            if task.recurrence_rule:
+                if self.remaining <= 0:
+                    self.truncate(task.id)
+                    continue
+                self.remaining -= 1
+            yield task
+
+def get_occurrences(task: Task, start_date: date, end_date: date, budget: Optional[OccurrenceBudget] = None) -> List[Task]:
+    """
+    Generates a list of task occurrences for a given recurring task within a date range.
+    If a budget is given, expansion stops once it is exhausted.
+    """
+    occurrences = iter_occurrences(task, start_date, end_date)
+    if budget is not None:
+        occurrences = budget.limit(task.id, occurrences)
+    return list(occurrences)
+
+# --- Parallel expansion across worker processes ---
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = Lock()
+
+def _expansion_workers() -> int:
+    # More workers than CPUs only adds pickling and scheduling overhead.
+    return min(settings.CALENDAR_EXPANSION_WORKERS, os.cpu_count() or 1)
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned workers do not inherit the web worker's threads or database connections.
+            _executor = ProcessPoolExecutor(
+                max_workers=_expansion_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+def _warm_up_worker() -> None:
+    # Unpickling this function in a new worker imports this module and its dependencies.
+    pass
+
+def start_executor() -> None:
+    """
+    Spawns the expansion workers in the background, so the first large calendar request
+    doesn't wait seconds for each of them to start and import numpy, pydantic and SQLAlchemy.
+    """
+    if _expansion_workers() > 1:
+        executor = _get_executor()
+        for _ in range(_expansion_workers()):
+            executor.submit(_warm_up_worker)
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
+
+def _due_date_key(task: Task):
+    # Tasks without a due date sort last.
+    return (task.due_date is None, task.due_date or date.min)
+
+def _expand_chunk(tasks: List[Task], start_date: date, end_date: date, per_task: int) -> Tuple[List[Task], List[int]]:
+    """
+    Expands a chunk of recurring tasks and returns the occurrences sorted by due date,
+    along with the IDs of tasks that hit the per-task budget.
+    """
+    occurrences = []
+    truncated_task_ids = []
+    for task in tasks:
+        try:
+            task_occurrences = list(itertools.islice(iter_occurrences(task, start_date, end_date), per_task + 1))
+        except Exception as e:
+            print(f"Error processing task {task.id}: {e}")
+            # Add the original task so it's not lost, even if recurrence fails
+            occurrences.append(task)
+            continue
+        if len(task_occurrences) > per_task:
+            truncated_task_ids.append(task.id)
+            task_occurrences = task_occurrences[:per_task]
+        occurrences.extend(task_occurrences)
+    occurrences.sort(key=_due_date_key)
+    return occurrences, truncated_task_ids
+
+def expand_in_parallel(tasks: Iterable[Task], start_date: date, end_date: date, budget: Optional[OccurrenceBudget] = None) -> List[Task]:
+    """
+    Expands tasks from any number of plans into their occurrences within a date range.
+
+    Recurring tasks are split into chunks that are expanded across a process pool once
+    there are at least CALENDAR_PARALLEL_MIN_TASKS of them (fewer are expanded inline,
+    where it is cheaper than shipping them to workers); each chunk comes back sorted and
+    the results are merged in due-date order.
+    The per-task budget is enforced in the workers and the per-request budget on the
+    merged result; truncated tasks are recorded on the budget.
+    """
+    if budget is None:
+        budget = OccurrenceBudget()
+    one_off_tasks = []
+    recurring_tasks = []
+    for task in tasks:
+        task = Task.model_validate(task)
+        if task.recurrence_rule and task.due_date:
+            recurring_tasks.append(task)
+        else:
+            one_off_tasks.append(task)
+    one_off_tasks.sort(key=_due_date_key)
+
+    chunk_size = max(1, settings.CALENDAR_CHUNK_SIZE)
+    chunks = [recurring_tasks[i:i + chunk_size] for i in range(0, len(recurring_tasks), chunk_size)]
+    if len(chunks) <= 1 or len(recurring_tasks) < settings.CALENDAR_PARALLEL_MIN_TASKS or _expansion_workers() <= 1:
+        results = [_expand_chunk(chunk, start_date, end_date, budget.per_task) for chunk in chunks]
+    else:
+        results = list(_get_executor().map(_expand_chunk, chunks, repeat(start_date), repeat(end_date), repeat(budget.per_task)))
 
-        occurrences.append(occurrence_task)
+    expanded = []
+    for occurrences, truncated_task_ids in results:
+        expanded.append(occurrences)
+        for task_id in truncated_task_ids:
+            budget.truncate(task_id)
 
-    return occurrences
\ No newline at end of file
+    merged = heapq.merge(one_off_tasks, *expanded, key=_due_date_key)
+    return list(budget.limit_total(merged))
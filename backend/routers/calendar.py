@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.orm import Session
+from typing import List
+from datetime import date
+
+import schemas
+import crud
+import recurrence
+from database import SessionLocal
+
+router = APIRouter()
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@router.get("/calendar", response_model=List[schemas.Task])
+def read_calendar_endpoint(
+    start_date: date,
+    end_date: date,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+
+    db_tasks = crud.get_tasks_in_date_range(db, start_date=start_date, end_date=end_date)
+    budget = recurrence.OccurrenceBudget()
+    occurrences = recurrence.expand_in_parallel(db_tasks, start_date, end_date, budget=budget)
+    if budget.truncated_task_ids:
+        response.headers["X-Truncated-Tasks"] = ",".join(str(task_id) for task_id in budget.truncated_task_ids)
+    return occurrences
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Header
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, create_model
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import FrozenSet, List, Optional, Type
+from functools import lru_cache
 
 import schemas
 import crud
+import versions
+import fieldsets
 from database import SessionLocal
 
 router = APIRouter()
@@ -28,22 +33,54 @@ def read_most_recent_garden_plan_endpoint(
 ):
     return crud.get_most_recent_garden_plan(db)
 
-@router.get("/garden-plans/", response_model=List[schemas.GardenPlan])
+@router.get("/garden-plans/", response_model=List[schemas.GardenPlanSummary])
 def read_all_garden_plans_endpoint(
     skip: int = 0, 
     limit: int = 100, 
     db: Session = Depends(get_db)
 ):
-    return crud.get_all_garden_plans(db, skip=skip, limit=limit)
+    # The listing only needs names, dates and counts; the full plan graph is served by the detail endpoint.
+    return crud.get_garden_plan_summaries(db, skip=skip, limit=limit)
+
+@lru_cache(maxsize=None)
+def _partial_plan_schema(planting_fields: FrozenSet[str]) -> Type[BaseModel]:
+    """The GardenPlan schema with its plantings trimmed to a fieldset."""
+    return create_model(
+        "GardenPlanPartial",
+        __base__=schemas.GardenPlan,
+        plantings=(List[fieldsets.partial_schema(schemas.Planting, planting_fields, base=schemas.LibraryPlantValues)], []),
+    )
 
 @router.get("/garden-plans/{plan_id}", response_model=schemas.GardenPlan)
 def read_single_garden_plan_endpoint(
     plan_id: int, 
+    response: Response,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
-    db_plan = crud.get_garden_plan_by_id(db, plan_id=plan_id)
+    # `fields` selects the planting columns; the plan's own fields and tasks are always returned.
+    try:
+        planting_fields = fieldsets.parse_fields(fields, schemas.Planting)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Unchanged plans are answered from the version counter without touching the database.
+    etag = versions.plan_etag(plan_id)
+    if versions.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    db_plan = crud.get_garden_plan_by_id(db, plan_id=plan_id, planting_fields=planting_fields)
     if db_plan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Garden Plan not found")
+    if planting_fields is not None:
+        partial = _partial_plan_schema(planting_fields)
+        return JSONResponse(
+            content=partial.model_validate(db_plan).model_dump(mode="json"),
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
+        )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
     return db_plan
 
 @router.delete("/garden-plans/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -55,7 +92,7 @@ def delete_garden_plan_endpoint(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Garden Plan not found")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-@router.put("/garden-plans/{plan_id}/touch", response_model=schemas.GardenPlan)
+@router.put("/garden-plans/{plan_id}/touch", response_model=schemas.GardenPlanTouch)
 def touch_garden_plan_endpoint(
     plan_id: int, 
     db: Session = Depends(get_db)
@@ -74,4 +111,17 @@ def create_planting_for_plan_endpoint(
     created = crud.create_planting(db, garden_plan_id=plan_id, planting_details=planting_details)
     if created is None:
         raise HTTPException(status_code=404, detail="Library plant not found")
-    return created
\ No newline at end of file
+    return created
+
+@router.post("/garden-plans/{plan_id}/plantings/bulk", response_model=List[schemas.Planting], status_code=status.HTTP_201_CREATED)
+def create_plantings_for_plan_endpoint(
+    plan_id: int,
+    plantings_details: List[schemas.PlantingCreate],
+    db: Session = Depends(get_db)
+):
+    if not plantings_details:
+        return []
+    created = crud.create_plantings_bulk(db, garden_plan_id=plan_id, plantings_details=plantings_details)
+    if created is None:
+        raise HTTPException(status_code=404, detail="Library plant not found")
+    return created
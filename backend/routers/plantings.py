@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from typing import Optional
 
 import schemas
 import crud
+import fieldsets
 from database import SessionLocal
 
 router = APIRouter()
@@ -15,10 +18,19 @@ def get_db():
         db.close()
 
 @router.get("/plantings/{planting_id}", response_model=schemas.PlantingDetail)
-def read_single_planting_endpoint(planting_id: int, db: Session = Depends(get_db)):
-    db_planting = crud.get_planting_by_id(db, planting_id=planting_id)
+def read_single_planting_endpoint(planting_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    try:
+        field_set = fieldsets.parse_fields(fields, schemas.PlantingDetail)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Only the requested columns are selected and serialized.
+    db_planting = crud.get_planting_by_id(db, planting_id=planting_id, fields=field_set)
     if db_planting is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Planting not found")
+    if field_set is not None:
+        partial = fieldsets.partial_schema(schemas.PlantingDetail, field_set, base=schemas.LibraryPlantValues)
+        return JSONResponse(content=partial.model_validate(db_planting).model_dump(mode="json"))
     return db_planting
 
 @router.put("/plantings/{planting_id}", response_model=schemas.Planting)
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Response, Header
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, FrozenSet, List, Optional
 
 import schemas
 import crud
 import csv_importer
+import plant_cache
+import pagination
+import fieldsets
+import versions
 from database import SessionLocal
 
 router = APIRouter()
@@ -16,19 +21,88 @@ def get_db():
     finally:
         db.close()
 
+def _parse_plant_fields(fields: Optional[str]):
+    # Plants are projected from the library cache, which already holds every column.
+    try:
+        return fieldsets.parse_fields(fields, schemas.Plant)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+def _plant_filters(
+    plant_family: Optional[List[str]] = Query(None),
+    plant_type: Optional[List[str]] = Query(None),
+    sunlight_requirement: Optional[List[str]] = Query(None),
+    water_needs: Optional[List[str]] = Query(None),
+    organic: Optional[bool] = None,
+    direct_seedable: Optional[bool] = None,
+    transplantable: Optional[bool] = None,
+) -> Dict[str, FrozenSet[Any]]:
+    # Repeated parameters match any of their values; different facets must all match.
+    filters = {
+        "plant_family": plant_family, "plant_type": plant_type,
+        "sunlight_requirement": sunlight_requirement, "water_needs": water_needs,
+        "organic": organic, "direct_seedable": direct_seedable, "transplantable": transplantable,
+    }
+    return {
+        column: frozenset(value if isinstance(value, list) else [value])
+        for column, value in filters.items() if value is not None
+    }
+
 @router.post("/plants/", response_model=schemas.Plant, status_code=status.HTTP_201_CREATED)
 def create_plant_endpoint(plant: schemas.PlantCreate, db: Session = Depends(get_db)):
     return crud.create_plant(db=db, plant=plant)
 
 @router.get("/plants/", response_model=List[schemas.Plant])
-def read_all_plants_endpoint(skip: int = 0, limit: int = 1000, db: Session = Depends(get_db)):
-    return crud.get_all_plants(db, skip=skip, limit=limit)
+def read_all_plants_endpoint(skip: int = 0, limit: int = 1000, cursor: Optional[str] = None, fields: Optional[str] = None, filters: Dict[str, FrozenSet[Any]] = Depends(_plant_filters), if_none_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    try:
+        after = pagination.decode_plant_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    field_set = _parse_plant_fields(fields)
+
+    # Unchanged libraries are answered from the version counter without touching the database.
+    etag = versions.library_etag()
+    if versions.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    # Served from the library cache as pre-encoded JSON, skipping validation and serialization.
+    # Filters are applied to the cached rows. Pages are keyed on (plant_name, id); a cursor
+    # takes precedence over skip.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if field_set is not None:
+        content, next_key = plant_cache.get_plants_fields(db, field_set, skip=skip, limit=limit, after=after, filters=filters)
+        response = JSONResponse(content=content, headers=headers)
+    else:
+        content, next_key = plant_cache.get_plants_json(db, skip=skip, limit=limit, after=after, filters=filters)
+        response = Response(content=content, media_type="application/json", headers=headers)
+    if next_key is not None:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = pagination.encode_cursor(*next_key)
+    return response
+
+@router.patch("/plants/", response_model=List[schemas.PlantBulkUpdateResult])
+def update_plants_bulk_endpoint(plant_updates: List[schemas.PlantBulkUpdate], db: Session = Depends(get_db)):
+    return crud.update_plants_bulk(db, plant_updates)
+
+@router.get("/plants/facets", response_model=schemas.PlantFacets)
+def read_plant_facets_endpoint(filters: Dict[str, FrozenSet[Any]] = Depends(_plant_filters), db: Session = Depends(get_db)):
+    return crud.get_plant_facets(db, filters)
+
+@router.get("/plants/search", response_model=List[schemas.Plant])
+def search_plants_endpoint(q: str, skip: int = 0, limit: int = Query(50, ge=1, le=500), db: Session = Depends(get_db)):
+    return crud.search_plants(db, q, skip=skip, limit=limit)
+
+@router.get("/plants/cache-stats")
+def read_plant_cache_stats_endpoint():
+    return plant_cache.cache_info()._asdict()
 
 @router.get("/plants/{plant_id}", response_model=schemas.Plant)
-def read_single_plant_endpoint(plant_id: int, db: Session = Depends(get_db)):
-    db_plant = crud.get_plant_by_id(db, plant_id=plant_id)
+def read_single_plant_endpoint(plant_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    field_set = _parse_plant_fields(fields)
+    db_plant = plant_cache.get_plant(db, plant_id=plant_id)
     if db_plant is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plant not found")
+    if field_set is not None:
+        return JSONResponse(content=db_plant.model_dump(mode="json", include=field_set))
     return db_plant
 
 @router.put("/plants/{plant_id}", response_model=schemas.Plant)
@@ -45,7 +119,7 @@ def delete_plant_endpoint(plant_id: int, db: Session = Depends(get_db)):
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 @router.post("/plants/import", response_model=schemas.ImportResult)
-async def import_plants_endpoint(
+def import_plants_endpoint(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     mode: str = Query("append", enum=["append", "replace"])
@@ -53,8 +127,8 @@ async def import_plants_endpoint(
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file type. Please upload a CSV file.")
 
-    content = await file.read()
-    result = csv_importer.process_csv_import(db=db, content=content, mode=mode)
+    # A sync endpoint runs in the threadpool, so the blocking reads of the spooled upload are fine.
+    result = csv_importer.process_csv_import(db=db, file=file.file, mode=mode)
 
     if result.errors and not result.imported_count and not result.updated_count:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result.errors)
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 from datetime import date, timedelta
+import itertools
+import json
 
 import schemas
 import crud
 import recurrence
+import pagination
 from database import SessionLocal
 
 router = APIRouter()
@@ -21,46 +25,131 @@ def get_db():
 def create_task_endpoint(task: schemas.TaskCreate, db: Session = Depends(get_db)):
     return crud.create_task(db=db, task=task)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+TRUNCATED_TASKS_HEADER = "X-Truncated-Tasks"
+
+def _expand_tasks(db_tasks: Iterable, occurrences_of: Callable[[schemas.Task], Iterator], budget: recurrence.OccurrenceBudget) -> Iterator:
+    """Yields each task, expanding recurring ones into their occurrences as it goes."""
+    for task in db_tasks:
+        if task.recurrence_rule:
+            # print(f"Processing Task ID: {task.id}, RRULE: {task.recurrence_rule}")
+            try:
+                yield from budget.limit(task.id, occurrences_of(task))
+            except Exception as e:
+                print(f"Error processing task {task.id}: {e}")
+                # Continue processing other tasks instead of crashing
+                # But also log to file for me to see
+                with open("bad_tasks.log", "a") as f:
+                    f.write(f"Task ID: {task.id}, RRULE: {task.recurrence_rule}, Error: {e}\n")
+                # Add the original task so it's not lost, even if recurrence fails
+                yield task
+        else:
+            yield task
+
+def _ndjson_lines(tasks: Iterable, budget: recurrence.OccurrenceBudget, db: Session) -> Iterator[str]:
+    """
+    Serializes tasks to newline-delimited JSON, one line per task. Since headers are
+    already sent, truncation is reported as a final {"truncated_task_ids": [...]} line.
+
+    The request's session is closed before the body is sent, but reading the tasks may
+    reopen it to fetch more occurrence rows, so it is closed again once the stream ends.
+    """
+    try:
+        for task in tasks:
+            yield schemas.Task.model_validate(task).model_dump_json() + "\n"
+        if budget.truncated_task_ids:
+            yield json.dumps({"truncated_task_ids": budget.truncated_task_ids}) + "\n"
+    finally:
+        db.close()
+
 @router.get("/garden-plans/{plan_id}/tasks/", response_model=List[schemas.Task])
 def read_tasks_for_plan_endpoint(
     plan_id: int,
+    request: Request,
+    response: Response,
     start_date: date = None,
     end_date: date = None,
+    mode: str = Query("range", enum=["range", "next"]),
+    count: int = Query(1, ge=1),
+    reference_date: date = None,
+    stream: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    db_tasks = crud.get_tasks_for_plan(db, plan_id=plan_id)
-    all_tasks = []
+    # With a limit, tasks are paged by (due_date, id) and each page's tasks are expanded;
+    # the key of the page's last task is returned as the next cursor.
+    try:
+        after = pagination.decode_task_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    paged = limit is not None or after is not None
+
+    budget = recurrence.OccurrenceBudget()
+    db_tasks = None
+    if mode == "next":
+        # Only the next `count` occurrences of each task on or after the reference date.
+        if not reference_date:
+            reference_date = date.today()
+        db_tasks = crud.get_tasks_for_plan(db, plan_id=plan_id, start_date=reference_date, limit=limit, after=after)
+        tasks = _expand_tasks(db_tasks, lambda task: recurrence.iter_next_occurrences(task, reference_date, count), budget)
+    else:
+        # Default range: 1 year past to 1 year future if not provided
+        if not start_date:
+            start_date = date.today() - timedelta(days=365)
+        if not end_date:
+            end_date = date.today() + timedelta(days=365)
+
+        # Ranges inside the materialized horizon are read from the occurrence index;
+        # anything else falls back to expanding the recurrence rules here.
+        indexed = None if paged else crud.get_indexed_tasks_for_plan(db, plan_id=plan_id, start_date=start_date, end_date=end_date)
+        if indexed is not None:
+            one_off_tasks, occurrence_rows, unindexed_tasks = indexed
+            tasks = itertools.chain(
+                budget.limit_total(itertools.chain(one_off_tasks, recurrence.iter_materialized_occurrences(occurrence_rows))),
+                # Tasks left out of the index are expanded here, against the same budget.
+                _expand_tasks(unindexed_tasks, lambda task: recurrence.iter_occurrences(task, start_date, end_date), budget),
+            )
+        else:
+            db_tasks = crud.get_tasks_for_plan(db, plan_id=plan_id, start_date=start_date, end_date=end_date, limit=limit, after=after)
+            tasks = _expand_tasks(db_tasks, lambda task: recurrence.iter_occurrences(task, start_date, end_date), budget)
+
+    # Streaming mode: occurrences are serialized as they are expanded, so memory
+    # stays flat regardless of the size of the date range.
+    headers = {}
+    if limit is not None and db_tasks is not None and len(db_tasks) == limit:
+        last_task = db_tasks[-1]
+        headers[pagination.NEXT_CURSOR_HEADER] = pagination.encode_cursor(last_task.due_date, last_task.id)
 
-    # Default range: 1 year past to 1 year future if not provided
-    if not start_date:
-        start_date = date.today() - timedelta(days=365)
-    if not end_date:
-        end_date = date.today() + timedelta(days=365)
+    if stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _ndjson_lines(tasks, budget, db),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
 
     try:
-        for task in db_tasks:
-            if task.recurrence_rule:
-                # print(f"Processing Task ID: {task.id}, RRULE: {task.recurrence_rule}")
-                try:
-                    all_tasks.extend(recurrence.get_occurrences(task, start_date, end_date))
-                except Exception as e:
-                    print(f"Error processing task {task.id}: {e}")
-                    # Continue processing other tasks instead of crashing
-                    # But also log to file for me to see
-                    with open("bad_tasks.log", "a") as f:
-                        f.write(f"Task ID: {task.id}, RRULE: {task.recurrence_rule}, Error: {e}\n")
-                    # Add the original task so it's not lost, even if recurrence fails
-                    all_tasks.append(task)
-            else:
-                all_tasks.append(task)
+        all_tasks = list(tasks)
     except Exception as e:
         import traceback
         with open("error.log", "w") as f:
             f.write(traceback.format_exc())
         raise e
 
+    response.headers.update(headers)
+    if budget.truncated_task_ids:
+        response.headers[TRUNCATED_TASKS_HEADER] = ",".join(str(task_id) for task_id in budget.truncated_task_ids)
     return all_tasks
 
+@router.get("/recurrence/cache-stats")
+def read_recurrence_cache_stats_endpoint():
+    return recurrence.rule_cache_info()._asdict()
+
+@router.get("/recurrence/budget-stats")
+def read_recurrence_budget_stats_endpoint():
+    return recurrence.budget_info()
+
 @router.put("/tasks/{task_id}", response_model=schemas.Task)
 def update_task_endpoint(task_id: int, task_update: schemas.TaskUpdate, db: Session = Depends(get_db)):
     updated_task = crud.update_task(db, task_id=task_id, task_update=task_update)
@@ -75,6 +164,10 @@ def complete_task_occurrence_endpoint(task_id: int, completion: schemas.TaskOccu
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     return updated_task
 
+@router.post("/tasks/complete-batch", response_model=List[schemas.TaskOccurrenceCompletionResult])
+def complete_task_occurrences_batch_endpoint(completions: List[schemas.TaskOccurrenceBatchCompletion], db: Session = Depends(get_db)):
+    return crud.complete_task_occurrences(db, completions=completions)
+
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task_endpoint(task_id: int, db: Session = Depends(get_db)):
     if not crud.delete_task(db, task_id=task_id):
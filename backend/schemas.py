@@ -1,7 +1,7 @@
 # backend/schemas.py
 # Removed PlantingGroup schemas and updated Planting schemas.
-from pydantic import BaseModel, ConfigDict, create_model
-from typing import Optional, List, Type
+from pydantic import BaseModel, ConfigDict, create_model, field_validator, model_validator
+from typing import Any, Dict, Optional, List, Type, Union
 from datetime import date, datetime
 from models import PlantingStatus, PlantingMethod, TaskStatus, HarvestMethod
 import enum
@@ -83,6 +83,23 @@ class Plant(PlantBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
 
+class FacetValueCount(BaseModel):
+    value: Optional[Union[bool, str]] = None
+    count: int
+
+PlantFacets = Dict[str, List[FacetValueCount]]
+
+class PlantBulkUpdate(PlantUpdate):
+    id: int
+
+class PlantBulkUpdateStatus(str, enum.Enum):
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+
+class PlantBulkUpdateResult(BaseModel):
+    id: int
+    status: PlantBulkUpdateStatus
+
 # --- Task Group Schemas ---
 class TaskGroupBase(BaseModel):
     pass
@@ -96,6 +113,12 @@ class TaskGroup(TaskGroupBase):
     model_config = ConfigDict(from_attributes=True)
 
 # --- Task Schemas ---
+def _blank_rule_to_none(value: Optional[str]) -> Optional[str]:
+    """Stores a blank recurrence rule as NULL, so the task is treated as non-recurring everywhere."""
+    if value is not None and not value.strip():
+        return None
+    return value
+
 class TaskBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -106,6 +129,8 @@ class TaskBase(BaseModel):
     completed_dates: Optional[List[date]] = []
     exdates: Optional[List[date]] = []
 
+    normalize_recurrence_rule = field_validator('recurrence_rule')(_blank_rule_to_none)
+
 class TaskCreate(TaskBase):
     garden_plan_id: int
     planting_id: Optional[int] = None
@@ -122,6 +147,8 @@ class TaskUpdate(BaseModel):
     completed_dates: Optional[List[date]] = None
     exdates: Optional[List[date]] = None
 
+    normalize_recurrence_rule = field_validator('recurrence_rule')(_blank_rule_to_none)
+
 class Task(TaskBase):
     id: int
     garden_plan_id: int
@@ -132,8 +159,49 @@ class Task(TaskBase):
 class TaskOccurrenceCompletion(BaseModel):
     completion_date: date
 
+class TaskOccurrenceBatchCompletion(TaskOccurrenceCompletion):
+    task_id: int
+
+class TaskOccurrenceCompletionResult(BaseModel):
+    task_id: int
+    completion_date: date
+    success: bool
+    detail: Optional[str] = None
+
 # --- Planting Schemas ---
-class Planting(PlantBase):
+class LibraryPlantValues(BaseModel):
+    """
+    Base for planting responses. Plantings store only overrides of their library plant's
+    fields, so when validating from a Planting row, fields it leaves NULL are filled in
+    from the row's library_plant, except those listed in its cleared_fields.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def resolve_library_values(cls, data: Any) -> Any:
+        # Check the class, not the row: touching the relationship on the row would load it.
+        if isinstance(data, dict) or not hasattr(type(data), "library_plant"):
+            return data
+        library_plant = None
+        cleared_fields = None
+        values = {}
+        for name in cls.model_fields:
+            if not hasattr(data, name):
+                continue
+            value = getattr(data, name)
+            if value is None and name in PlantBase.model_fields:
+                if cleared_fields is None:
+                    cleared_fields = data.cleared_fields or ()
+                if name not in cleared_fields:
+                    # Only rows that actually inherit a value read the library plant.
+                    if library_plant is None:
+                        library_plant = data.library_plant
+                    value = getattr(library_plant, name, None)
+            values[name] = value
+        return values
+
+class Planting(LibraryPlantValues, PlantBase):
     id: int
     library_plant_id: int
     quantity: int
@@ -195,3 +263,16 @@ class GardenPlan(GardenPlanBase):
     plantings: List[Planting] = []
     tasks: List[Task] = []
     model_config = ConfigDict(from_attributes=True)
+
+class GardenPlanTouch(BaseModel):
+    id: int
+    last_accessed_date: datetime
+
+class GardenPlanSummary(GardenPlanBase):
+    id: int
+    created_date: date
+    last_accessed_date: datetime
+    planting_count: int = 0
+    task_count: int = 0
+    pending_task_count: int = 0
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,54 @@
+# backend/versions.py
+"""
+In-process version counters for conditional GETs.
+
+crud write functions bump the version of the garden plan or plant library they change,
+and read endpoints turn the current version into an ETag. A matching If-None-Match can
+then be answered with 304 before anything is loaded from the database.
+
+Counters live in this process only, which matches the single uvicorn worker the app
+runs under. The process epoch is part of every ETag so tags handed out before a restart
+never match.
+"""
+import uuid
+from threading import Lock
+from typing import Dict, Optional
+
+_epoch = uuid.uuid4().hex[:8]
+_lock = Lock()
+_library_version = 0
+_plan_versions: Dict[int, int] = {}
+
+def bump_library() -> None:
+    global _library_version
+    with _lock:
+        _library_version += 1
+
+def bump_plan(plan_id: Optional[int]) -> None:
+    if plan_id is None:
+        return
+    with _lock:
+        _plan_versions[plan_id] = _plan_versions.get(plan_id, 0) + 1
+
+def library_version() -> int:
+    return _library_version
+
+def plan_version(plan_id: int) -> int:
+    return _plan_versions.get(plan_id, 0)
+
+def library_etag() -> str:
+    return f'"library-{_epoch}-{_library_version}"'
+
+def plan_etag(plan_id: int) -> str:
+    # Plantings inherit library plant values, so library changes also change plan responses.
+    return f'"plan-{plan_id}-{_epoch}-{plan_version(plan_id)}-{_library_version}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Checks an If-None-Match header value, which may list several (possibly weak) tags."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -16,8 +16,8 @@ import {
 import Papa from 'papaparse';
 import { useNavigate, useOutletContext } from 'react-router-dom';
 
-import { Plant, AppContextType, GardenPlan } from './types';
-import { useGetPlantsQuery, useUpdatePlantMutation, useAddPlantMutation, useDeletePlantMutation, useImportPlantsMutation, useGetMostRecentGardenPlanQuery, useImportMappedPlantsMutation } from './store/plantApi';
+import { Plant, AppContextType, GardenPlan, PlantBulkUpdateResult } from './types';
+import { useGetPlantsQuery, useUpdatePlantsBulkMutation, useAddPlantMutation, useDeletePlantMutation, useImportPlantsMutation, useGetMostRecentGardenPlanQuery, useImportMappedPlantsMutation } from './store/plantApi';
 import { useColumnPresets } from './hooks/useColumnPresets';
 import { useTableModals } from './hooks/useTableModals';
 import Toolbar from './components/Toolbar';
@@ -31,7 +31,7 @@ import { getColumns } from './components/columns';
 
 const BulkEditTable: React.FC = () => {
   const { data: serverData, error, isLoading } = useGetPlantsQuery();
-  const [updatePlant, { isLoading: isUpdatingPlant }] = useUpdatePlantMutation();
+  const [updatePlantsBulk, { isLoading: isUpdatingPlant }] = useUpdatePlantsBulkMutation();
   const [addPlant, { isLoading: isAddingPlant }] = useAddPlantMutation();
   const [deletePlant, { isLoading: isDeletingPlant }] = useDeletePlantMutation();
   const { data: recentPlan } = useGetMostRecentGardenPlanQuery();
@@ -359,19 +359,22 @@ const BulkEditTable: React.FC = () => {
             return addPlant(plantData as Omit<Plant, 'id'>).unwrap();
         });
 
-    const updatePromises = editedPlants
-        .filter(p => p.id > 0)
-        .map(p => updatePlant(p).unwrap());
+    const updatedPlants = editedPlants.filter(p => p.id > 0);
+    const updatePromise = updatedPlants.length > 0 ? updatePlantsBulk(updatedPlants).unwrap() : Promise.resolve<PlantBulkUpdateResult[]>([]);
 
-    const promise = Promise.all([...createPromises, ...updatePromises]);
+    const promise = Promise.all([Promise.all(createPromises), updatePromise]).then(([, updateResults]) => {
+        // Rows the server couldn't update stay dirty so they can be fixed and saved again.
+        const failedIds = updateResults.filter(result => result.status !== 'updated').map(result => result.id);
+        setEditedRows(prev => Object.fromEntries(Object.entries(prev).filter(([, p]) => failedIds.includes(p.id))));
+        if (failedIds.length > 0) {
+            throw new Error(`Plants not found: ${failedIds.join(', ')}`);
+        }
+    });
 
     toast.promise(promise, {
         loading: 'Saving changes...',
-        success: () => {
-            setEditedRows({});
-            return 'All changes saved successfully!';
-        },
-        error: 'Failed to save some changes.',
+        success: 'All changes saved successfully!',
+        error: (err) => err instanceof Error ? `Failed to save some changes. ${err.message}` : 'Failed to save some changes.',
     });
   }
 
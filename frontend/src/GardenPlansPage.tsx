@@ -3,7 +3,7 @@ import { Link, useNavigate } from 'react-router-dom';
 import toast from 'react-hot-toast';
 import { useGetGardenPlansQuery, useAddGardenPlanMutation, useDeleteGardenPlanMutation } from './store/plantApi';
 import { usePlan } from './context/PlanContext';
-import { GardenPlan } from './types';
+import { GardenPlanSummary } from './types';
 import DeleteConfirmModal from './components/DeleteConfirmModal';
 
 const GardenPlansPage: React.FC = () => {
@@ -17,7 +17,7 @@ const GardenPlansPage: React.FC = () => {
   const [newPlanDescription, setNewPlanDescription] = useState('');
   const [error, setError] = useState<string | null>(null);
   const [isDeleteModalOpen, setIsDeleteModalOpen] = useState(false);
-  const [planToDelete, setPlanToDelete] = useState<GardenPlan | null>(null);
+  const [planToDelete, setPlanToDelete] = useState<GardenPlanSummary | null>(null);
 
   useEffect(() => {
     if (isSuccess && newPlanData) {
@@ -52,7 +52,7 @@ const GardenPlansPage: React.FC = () => {
     });
   };
 
-  const openDeleteModal = (plan: GardenPlan) => {
+  const openDeleteModal = (plan: GardenPlanSummary) => {
     setPlanToDelete(plan);
     setIsDeleteModalOpen(true);
   };
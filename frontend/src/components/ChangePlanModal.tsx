@@ -2,7 +2,7 @@ import React, { useState, Fragment } from 'react';
 import { Dialog, Transition } from '@headlessui/react';
 import { useGetGardenPlansQuery, useAddGardenPlanMutation } from '../store/plantApi';
 import { usePlan } from '../context/PlanContext';
-import { GardenPlan } from '../types';
+import { GardenPlanSummary } from '../types';
 
 interface ChangePlanModalProps {
   isOpen: boolean;
@@ -17,7 +17,7 @@ const ChangePlanModal: React.FC<ChangePlanModalProps> = ({ isOpen, onClose }) =>
   const [newPlanName, setNewPlanName] = useState('');
   const [newPlanDescription, setNewPlanDescription] = useState('');
 
-  const handleSelectPlan = (plan: GardenPlan) => {
+  const handleSelectPlan = (plan: GardenPlanSummary) => {
     setActivePlan(plan);
     onClose();
   };
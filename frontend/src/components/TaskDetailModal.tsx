@@ -162,7 +162,7 @@ const TaskDetailModal: React.FC<TaskDetailModalProps> = ({ isOpen, onClose, task
                         <RecurrenceEditor
                           value={rrule}
                           onChange={setRrule}
-                          startDate={activePlan && activePlan.tasks.find(t => t.id === task?.id)?.due_date ? new Date(activePlan.tasks.find(t => t.id === task?.id)?.due_date + 'T00:00:00') : (document.getElementById('taskDueDateModal') as HTMLInputElement)?.value ? new Date((document.getElementById('taskDueDateModal') as HTMLInputElement).value + 'T00:00:00') : undefined}
+                          startDate={activePlan && 'tasks' in activePlan && activePlan.tasks.find(t => t.id === task?.id)?.due_date ? new Date(activePlan.tasks.find(t => t.id === task?.id)?.due_date + 'T00:00:00') : (document.getElementById('taskDueDateModal') as HTMLInputElement)?.value ? new Date((document.getElementById('taskDueDateModal') as HTMLInputElement).value + 'T00:00:00') : undefined}
                         />
                       )}
                     </div>
@@ -1,20 +1,23 @@
 import React, { createContext, useState, useContext, ReactNode, useMemo, useCallback } from 'react';
-import { GardenPlan } from '../types';
+import { GardenPlan, GardenPlanSummary } from '../types';
+
+// Plans picked from the listing only carry summary fields; the full plan is fetched by id.
+type ActivePlan = GardenPlan | GardenPlanSummary;
 import { useTouchGardenPlanMutation } from '../store/plantApi';
 
 interface PlanContextType {
-  activePlan: GardenPlan | null;
-  setActivePlan: (plan: GardenPlan | null) => void;
+  activePlan: ActivePlan | null;
+  setActivePlan: (plan: ActivePlan | null) => void;
   clearActivePlan: () => void;
 }
 
 const PlanContext = createContext<PlanContextType | undefined>(undefined);
 
 export const PlanProvider: React.FC<{ children: ReactNode }> = ({ children }) => {
-  const [activePlan, setActivePlanState] = useState<GardenPlan | null>(null);
+  const [activePlan, setActivePlanState] = useState<ActivePlan | null>(null);
   const [touchGardenPlan] = useTouchGardenPlanMutation();
 
-  const setActivePlan = useCallback((plan: GardenPlan | null) => {
+  const setActivePlan = useCallback((plan: ActivePlan | null) => {
     setActivePlanState(plan);
     // When a plan is set as active, "touch" it on the backend to update its last_accessed_date
     if (plan) {
@@ -1,5 +1,5 @@
 import { createApi, fetchBaseQuery } from '@reduxjs/toolkit/query/react';
-import { Plant, GardenPlan, Planting, PlantingCreatePayload, Task, User, RecurringTask } from '../types';
+import { Plant, GardenPlan, GardenPlanSummary, GardenPlanTouch, Planting, PlantBulkUpdateResult, PlantFacets, PlantingCreatePayload, Task, User, RecurringTask } from '../types';
 
 // Define a service using a base URL and expected endpoints
 export const plantApi = createApi({
@@ -21,6 +21,14 @@ export const plantApi = createApi({
       query: () => 'plants/',
       providesTags: (result) => result ? [...result.map(({ id }) => ({ type: 'Plant' as const, id })), { type: 'Plant', id: 'LIST' }] : [{ type: 'Plant', id: 'LIST' }],
     }),
+    getPlantFacets: builder.query<PlantFacets, void>({
+      query: () => 'plants/facets',
+      providesTags: [{ type: 'Plant', id: 'LIST' }],
+    }),
+    searchPlants: builder.query<Plant[], { q: string, skip?: number, limit?: number }>({
+      query: (params) => ({ url: 'plants/search', params }),
+      providesTags: (result) => result ? [...result.map(({ id }) => ({ type: 'Plant' as const, id })), { type: 'Plant', id: 'LIST' }] : [{ type: 'Plant', id: 'LIST' }],
+    }),
     getPlantById: builder.query<Plant, number>({
       query: (id) => `plants/${id}`,
       providesTags: (result, error, id) => [{ type: 'Plant', id }],
@@ -33,6 +41,10 @@ export const plantApi = createApi({
       query: ({ id, ...patch }) => ({ url: `plants/${id}`, method: 'PUT', body: patch }),
       invalidatesTags: (result, error, { id }) => [{ type: 'Plant', id }],
     }),
+    updatePlantsBulk: builder.mutation<PlantBulkUpdateResult[], (Partial<Plant> & Pick<Plant, 'id'>)[]>({
+      query: (updates) => ({ url: 'plants/', method: 'PATCH', body: updates }),
+      invalidatesTags: (result) => result ? result.map(({ id }) => ({ type: 'Plant' as const, id })) : [],
+    }),
     deletePlant: builder.mutation<{ success: boolean; id: number }, number>({
       query: (id) => ({ url: `plants/${id}`, method: 'DELETE' }),
       invalidatesTags: (result, error, id) => [{ type: 'Plant', id }],
@@ -47,7 +59,7 @@ export const plantApi = createApi({
     }),
 
     // --- Garden Plan Endpoints ---
-    getGardenPlans: builder.query<GardenPlan[], void>({
+    getGardenPlans: builder.query<GardenPlanSummary[], void>({
         query: () => 'garden-plans/',
         providesTags: (result) => result ? [...result.map(({ id }) => ({ type: 'GardenPlan' as const, id })), { type: 'GardenPlan', id: 'LIST' }] : [{ type: 'GardenPlan', id: 'LIST' }],
     }),
@@ -67,7 +79,7 @@ export const plantApi = createApi({
       query: (id) => ({ url: `garden-plans/${id}`, method: 'DELETE' }),
       invalidatesTags: (result, error, id) => [{ type: 'GardenPlan', id: 'LIST' }],
     }),
-    touchGardenPlan: builder.mutation<GardenPlan, number>({
+    touchGardenPlan: builder.mutation<GardenPlanTouch, number>({
         query: (id) => ({ url: `garden-plans/${id}/touch`, method: 'PUT' }),
         invalidatesTags: (result, error, id) => [{ type: 'GardenPlan', id: 'LIST' }],
     }),
@@ -81,6 +93,10 @@ export const plantApi = createApi({
         query: ({ planId, payload }) => ({ url: `garden-plans/${planId}/plantings`, method: 'POST', body: payload }),
         invalidatesTags: (result, error, { planId }) => [{ type: 'GardenPlan', id: planId }],
     }),
+    addPlantingsBulk: builder.mutation<Planting[], { planId: number, payloads: PlantingCreatePayload[] }>({
+        query: ({ planId, payloads }) => ({ url: `garden-plans/${planId}/plantings/bulk`, method: 'POST', body: payloads }),
+        invalidatesTags: (result, error, { planId }) => [{ type: 'GardenPlan', id: planId }],
+    }),
     updatePlanting: builder.mutation<Planting, Partial<Planting> & Pick<Planting, 'id'>>({
         query: ({ id, ...patch }) => ({ url: `plantings/${id}`, method: 'PUT', body: patch }),
         invalidatesTags: (result, error, { id }) => [{ type: 'Planting', id }, { type: 'GardenPlan', id: result?.garden_plan_id }],
@@ -116,6 +132,14 @@ export const plantApi = createApi({
         }),
         invalidatesTags: (result, error, { taskId }) => [{ type: 'Task', id: taskId }, { type: 'Task', id: 'LIST' }],
     }),
+    completeTaskOccurrences: builder.mutation<{ task_id: number; completion_date: string; success: boolean; detail?: string }[], { taskId: number; completionDate: string }[]>({
+        query: (completions) => ({
+            url: 'tasks/complete-batch',
+            method: 'POST',
+            body: completions.map(({ taskId, completionDate }) => ({ task_id: taskId, completion_date: completionDate })),
+        }),
+        invalidatesTags: [{ type: 'Task', id: 'LIST' }],
+    }),
 
     // --- Task Group Endpoints ---
     updateTaskGroup: builder.mutation<Task[], { groupId: number, dateDiffDays: number }>({
@@ -142,9 +166,12 @@ export const plantApi = createApi({
 export const {
   useGetBackendVersionQuery,
   useGetPlantsQuery,
+  useGetPlantFacetsQuery,
+  useSearchPlantsQuery,
   useGetPlantByIdQuery,
   useAddPlantMutation,
   useUpdatePlantMutation,
+  useUpdatePlantsBulkMutation,
   useDeletePlantMutation,
   useImportPlantsMutation,
   useGetGardenPlansQuery,
@@ -155,6 +182,7 @@ export const {
   useTouchGardenPlanMutation,
   useGetPlantingByIdQuery,
   useAddPlantingMutation,
+  useAddPlantingsBulkMutation,
   useUpdatePlantingMutation,
   useDeletePlantingMutation,
   useGetTasksForPlanQuery,
@@ -162,6 +190,7 @@ export const {
   useUpdateTaskMutation,
   useDeleteTaskMutation,
   useCompleteTaskOccurrenceMutation,
+  useCompleteTaskOccurrencesMutation,
   useUpdateTaskGroupMutation,
   useUnlinkTaskGroupMutation,
   useImportMappedPlantsMutation,
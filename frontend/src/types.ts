@@ -157,6 +157,34 @@ export interface GardenPlan {
     recurring_tasks: RecurringTask[];
 }
 
+export interface GardenPlanTouch {
+    id: number;
+    last_accessed_date: string;
+}
+
+export interface GardenPlanSummary {
+    id: number;
+    name: string;
+    description?: string | null;
+    created_date: string;
+    last_accessed_date: string;
+    planting_count: number;
+    task_count: number;
+    pending_task_count: number;
+}
+
+export interface FacetValueCount {
+    value: string | boolean | null;
+    count: number;
+}
+
+export type PlantFacets = Record<string, FacetValueCount[]>;
+
+export interface PlantBulkUpdateResult {
+    id: number;
+    status: 'updated' | 'not_found';
+}
+
 export type AppContextType = {
     isPageDirty: boolean;
     setIsPageDirty: (isDirty: boolean) => void;
@@ -0,0 +1,97 @@
+"""
+Regression test for the number of SQL statements a garden plan read takes.
+
+Loading and serializing a plan should cost a fixed number of queries however many
+plantings it has, both for the full response and for a ?fields= sparse fieldset.
+Run with `python test_garden_plan_queries.py` or pytest.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import crud
+import fieldsets
+import models
+import schemas
+from routers.garden_plans import _partial_plan_schema
+
+# plan, plantings, planting tasks and their occurrence states, library plants,
+# plan tasks and their occurrence states
+FULL_PLAN_STATEMENTS = 7
+# plan, plantings, plan tasks and their occurrence states
+SPARSE_PLAN_STATEMENTS = 4
+
+def _make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def _seed_plan(db, planting_count: int) -> int:
+    plant = models.Plant(plant_name="Tomato", variety_name="Brandywine")
+    plan = models.GardenPlan(name="Plan")
+    db.add_all([plant, plan])
+    db.flush()
+    for i in range(planting_count):
+        planting = models.Planting(garden_plan_id=plan.id, library_plant_id=plant.id, quantity=i + 1)
+        # Every other planting overrides a library value, the rest inherit it.
+        if i % 2:
+            planting.variety_name = "Cherokee"
+        db.add(planting)
+        db.flush()
+        db.add(models.Task(garden_plan_id=plan.id, planting_id=planting.id, name=f"Sow {i}"))
+    db.add(models.Task(garden_plan_id=plan.id, name="Weed"))
+    db.commit()
+    return plan.id
+
+def _count_statements(engine, read) -> int:
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        read()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(statements)
+
+def _plan_read_statements(planting_count: int, fields=None) -> int:
+    engine, db = _make_session()
+    try:
+        plan_id = _seed_plan(db, planting_count)
+        db.expunge_all()
+        planting_fields = fieldsets.parse_fields(fields, schemas.Planting)
+
+        def read():
+            db_plan = crud.get_garden_plan_by_id(db, plan_id, planting_fields=planting_fields)
+            schema = _partial_plan_schema(planting_fields) if planting_fields else schemas.GardenPlan
+            plan = schema.model_validate(db_plan)
+            assert len(plan.plantings) == planting_count
+
+        return _count_statements(engine, read)
+    finally:
+        db.close()
+        engine.dispose()
+
+def test_full_plan_read_statement_count():
+    assert _plan_read_statements(200) == FULL_PLAN_STATEMENTS
+
+def test_sparse_plan_read_statement_count():
+    assert _plan_read_statements(200, "quantity") == SPARSE_PLAN_STATEMENTS
+
+def test_sparse_plan_read_with_library_fields_statement_count():
+    # Library fields add the library plants query, and nothing per planting.
+    assert _plan_read_statements(200, "plant_name,variety_name,quantity") == SPARSE_PLAN_STATEMENTS + 1
+
+if __name__ == "__main__":
+    for planting_count in (20, 200):
+        print(f"{planting_count} plantings: full={_plan_read_statements(planting_count)}, "
+              f"quantity={_plan_read_statements(planting_count, 'quantity')}, "
+              f"library fields={_plan_read_statements(planting_count, 'plant_name,variety_name,quantity')}")
+    test_full_plan_read_statement_count()
+    test_sparse_plan_read_statement_count()
+    test_sparse_plan_read_with_library_fields_statement_count()
+    print("OK")
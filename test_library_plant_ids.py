@@ -0,0 +1,67 @@
+"""
+Regression test for plant id reuse.
+
+Plantings keep their library_plant_id after the library plant is deleted, and read
+their NULL fields from whichever plant has that id. A new plant must therefore never
+get the id of a deleted one, or orphaned plantings start showing its values.
+Run with `python test_library_plant_ids.py` or pytest.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import crud
+import models
+import schemas
+
+def _make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def _orphaned_planting(delete_plants) -> schemas.Planting:
+    """Plants a Chili, deletes the library plant(s), adds a Lettuce and rereads the planting."""
+    engine, db = _make_session()
+    try:
+        crud.create_plant(db, schemas.PlantCreate(plant_name="Tomato", variety_name="Roma"))
+        chili = crud.create_plant(db, schemas.PlantCreate(plant_name="Chili", variety_name="Jalapeno"))
+        plan = crud.create_garden_plan(db, schemas.GardenPlanCreate(name="Plan"))
+        planting_id = crud.create_planting(db, plan.id, schemas.PlantingCreate(library_plant_id=chili.id)).id
+        chili_id = chili.id
+
+        delete_plants(db, chili_id)
+        lettuce = crud.create_plant(db, schemas.PlantCreate(plant_name="Lettuce", variety_name="Romaine"))
+        assert lettuce.id != chili_id
+
+        db.expunge_all()
+        return schemas.Planting.model_validate(crud.get_planting_by_id(db, planting_id))
+    finally:
+        db.close()
+        engine.dispose()
+
+def _delete_plant(db, plant_id: int):
+    assert crud.delete_plant_by_id(db, plant_id)
+
+def _delete_all_plants(db, plant_id: int):
+    # What a replace-mode CSV import does before inserting the new library.
+    crud.detach_plantings(db)
+    db.query(models.Plant).delete()
+    db.commit()
+
+def test_deleted_plant_id_is_not_reused():
+    planting = _orphaned_planting(_delete_plant)
+    assert (planting.plant_name, planting.variety_name) == ("Chili", "Jalapeno")
+
+def test_replaced_library_does_not_reuse_ids():
+    planting = _orphaned_planting(_delete_all_plants)
+    assert (planting.plant_name, planting.variety_name) == ("Chili", "Jalapeno")
+
+if __name__ == "__main__":
+    test_deleted_plant_id_is_not_reused()
+    test_replaced_library_does_not_reuse_ids()
+    print("OK")
@@ -0,0 +1,78 @@
+"""
+Randomized parity test for the vectorized recurrence fast path.
+
+Generates simple DAILY/WEEKLY/MONTHLY rules with random INTERVAL, BYDAY, UNTIL, COUNT
+and WKST parts, and checks that recurrence._simple_rule_dates returns exactly the
+dates dateutil produces for the same rule, start date and window.
+Run with `python test_recurrence_fast_path.py [cases]` or pytest.
+"""
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from dateutil.rrule import rrulestr
+
+import recurrence
+
+WEEKDAY_NAMES = list(recurrence.WEEKDAYS)
+SEED = 20261017
+
+def _random_rule(rng: random.Random, dtstart: date) -> str:
+    freq = rng.choice(["DAILY", "WEEKLY", "MONTHLY"])
+    parts = [f"FREQ={freq}"]
+    if rng.random() < 0.7:
+        parts.append(f"INTERVAL={rng.randint(1, 4)}")
+    if freq != "MONTHLY" and rng.random() < 0.5:
+        parts.append("BYDAY=" + ",".join(rng.sample(WEEKDAY_NAMES, rng.randint(1, 4))))
+    if freq == "WEEKLY" and rng.random() < 0.3:
+        parts.append(f"WKST={rng.choice(WEEKDAY_NAMES)}")
+    ending = rng.random()
+    if ending < 0.3:
+        until = dtstart + timedelta(days=rng.randint(0, 800))
+        parts.append(f"UNTIL={until:%Y%m%d}T000000" + rng.choice(["", "Z"]))
+    elif ending < 0.6:
+        parts.append(f"COUNT={rng.randint(0, 60)}")
+    rng.shuffle(parts)
+    return ";".join(parts)
+
+def _dateutil_dates(rule_string: str, dtstart: date, start_date: date, end_date: date):
+    rule = rrulestr(rule_string, dtstart=datetime.combine(dtstart, datetime.min.time()))
+    return [
+        occurrence.date()
+        for occurrence in rule.between(
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date, datetime.max.time()),
+            inc=True,
+        )
+    ]
+
+def check_parity(cases: int = 2000, seed: int = SEED) -> int:
+    """Compares both paths on random rules; returns how many rules took the fast path."""
+    rng = random.Random(seed)
+    checked = 0
+    for _ in range(cases):
+        dtstart = date(2024, 1, 1) + timedelta(days=rng.randint(0, 1100))
+        rule_string = recurrence.normalize_rule(_random_rule(rng, dtstart))
+        simple_rule = recurrence.parse_simple_rule(rule_string)
+        assert simple_rule is not None, f"Rule not taken by the fast path: {rule_string}"
+
+        start_date = dtstart + timedelta(days=rng.randint(-60, 400))
+        end_date = start_date + timedelta(days=rng.randint(0, 500))
+        expected = _dateutil_dates(rule_string, dtstart, start_date, end_date)
+        actual = recurrence._simple_rule_dates(simple_rule, dtstart, start_date, end_date).tolist()
+        assert actual == expected, (
+            f"{rule_string} from {dtstart}, window {start_date}..{end_date}: "
+            f"fast path {actual[:5]}... ({len(actual)}), dateutil {expected[:5]}... ({len(expected)})"
+        )
+        checked += 1
+    return checked
+
+def test_simple_rule_dates_match_dateutil():
+    check_parity()
+
+if __name__ == "__main__":
+    cases = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{check_parity(cases)} random rules matched dateutil")